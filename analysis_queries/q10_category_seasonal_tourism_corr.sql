@@ -0,0 +1,37 @@
+-- Q10 (push-down): correlation of monthly category sales with tourism, computed in PostgreSQL.
+-- Returns one row per category with the pair count and Pearson r; the p-value is derived from them in Python.
+WITH monthly_category_sales AS (
+    SELECT
+        d.month_of_year,
+        p.category,
+        SUM(fs.sales_amount) AS category_sales
+    FROM fact_sales fs
+    JOIN dim_date d ON fs.date_key = d.date_key
+    JOIN dim_product p ON fs.product_key = p.product_key
+    GROUP BY d.month_of_year, p.category
+),
+monthly_tourism_total AS (
+    SELECT
+        d.month_of_year,
+        SUM(ft.visitor_count) AS total_visitors
+    FROM fact_tourism ft
+    JOIN dim_date d ON ft.date_key = d.date_key
+    GROUP BY d.month_of_year
+),
+category_months AS (
+    SELECT
+        dcs.category,
+        dcs.category_sales::double precision AS category_sales,
+        COALESCE(t.total_visitors, 0)::double precision AS total_visitors
+    FROM monthly_category_sales dcs
+    LEFT JOIN monthly_tourism_total t ON dcs.month_of_year = t.month_of_year
+)
+SELECT
+    category,
+    'category_sales' AS x,
+    'total_visitors' AS y,
+    regr_count(total_visitors, category_sales) AS n,
+    corr(category_sales, total_visitors) AS r
+FROM category_months
+GROUP BY category
+ORDER BY category;
@@ -1,5 +1,5 @@
 -- SQL query to calculate sales per capita over time.
--- This query joins sales data with population data and groups by municipality and month.
+-- This query joins monthly sales with the monthly population of each municipality.
 
 WITH monthly_sales AS (
     SELECT
@@ -14,15 +14,14 @@ WITH monthly_sales AS (
     GROUP BY d.year, d.month_of_year, m.name
 ),
 monthly_population AS (
+    -- Interpolated monthly population, precomputed at load time
     SELECT
-        d.year,
-        d.month_of_year,
+        pm.year,
+        pm.month_of_year,
         m.name AS municipality_name,
-        SUM(fd.population_count) AS total_population
-    FROM fact_demographics fd
-    JOIN dim_date d ON fd.date_key = d.date_key
-    JOIN dim_municipality m ON fd.municipality_key = m.municipality_key
-    GROUP BY d.year, d.month_of_year, m.name
+        pm.population AS total_population
+    FROM fact_population_monthly pm
+    JOIN dim_municipality m ON pm.municipality_key = m.municipality_key
 )
 SELECT
     ms.year,
@@ -10,15 +10,12 @@ WITH sales_summary AS (
     GROUP BY m.municipality_key, m.name
 ),
 population_summary AS (
-    -- Use the latest available year for population to calculate "current" per capita
-    SELECT
-        m.municipality_key,
-        SUM(fd.population_count) AS total_population
-    FROM fact_demographics fd
-    JOIN dim_municipality m ON fd.municipality_key = m.municipality_key
-    JOIN dim_date d ON fd.date_key = d.date_key
-    WHERE d.year = (SELECT MAX(year) FROM dim_date WHERE date_key IN (SELECT date_key FROM fact_demographics))
-    GROUP BY m.municipality_key
+    -- Latest available population of each municipality for "current" per capita
+    SELECT DISTINCT ON (municipality_key)
+        municipality_key,
+        population AS total_population
+    FROM fact_population_yearly
+    ORDER BY municipality_key, year DESC
 ),
 tourism_summary AS (
     SELECT
@@ -0,0 +1,50 @@
+-- Q3 (push-down): correlation of sales per capita with tourism across municipalities, computed in PostgreSQL.
+-- Returns one row per compared pair with the pair count and Pearson r; the p-value is derived from them in Python.
+WITH sales_summary AS (
+    SELECT
+        m.municipality_key,
+        SUM(fs.sales_amount) AS total_sales
+    FROM fact_sales fs
+    JOIN dim_store s ON fs.store_key = s.store_key
+    JOIN dim_municipality m ON s.municipality_key = m.municipality_key
+    GROUP BY m.municipality_key
+),
+population_summary AS (
+    -- Latest available population of each municipality for "current" per capita
+    SELECT DISTINCT ON (municipality_key)
+        municipality_key,
+        population AS total_population
+    FROM fact_population_yearly
+    ORDER BY municipality_key, year DESC
+),
+tourism_summary AS (
+    SELECT
+        m.municipality_key,
+        SUM(ft.visitor_count) AS total_visitors,
+        SUM(ft.revenue) AS total_tourism_revenue
+    FROM fact_tourism ft
+    JOIN dim_municipality m ON ft.municipality_key = m.municipality_key
+    GROUP BY m.municipality_key
+),
+per_municipality AS (
+    SELECT
+        (s.total_sales / NULLIF(p.total_population, 0))::double precision AS sales_per_capita,
+        COALESCE(t.total_visitors, 0)::double precision AS total_visitors,
+        COALESCE(t.total_tourism_revenue, 0)::double precision AS total_tourism_revenue
+    FROM sales_summary s
+    LEFT JOIN population_summary p ON s.municipality_key = p.municipality_key
+    LEFT JOIN tourism_summary t ON s.municipality_key = t.municipality_key
+)
+SELECT
+    'sales_per_capita' AS x,
+    'total_visitors' AS y,
+    regr_count(total_visitors, sales_per_capita) AS n,
+    corr(sales_per_capita, total_visitors) AS r
+FROM per_municipality
+UNION ALL
+SELECT
+    'sales_per_capita' AS x,
+    'total_tourism_revenue' AS y,
+    regr_count(total_tourism_revenue, sales_per_capita) AS n,
+    corr(sales_per_capita, total_tourism_revenue) AS r
+FROM per_municipality;
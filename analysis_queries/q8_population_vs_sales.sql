@@ -4,16 +4,9 @@ WITH population_stats AS (
     SELECT
         m.municipality_key,
         m.name AS municipality,
-        AVG(yearly_pop) AS avg_population
-    FROM (
-        SELECT
-            municipality_key,
-            date_key,
-            SUM(population_count) as yearly_pop
-        FROM fact_demographics
-        GROUP BY municipality_key, date_key
-    ) sub
-    JOIN dim_municipality m ON sub.municipality_key = m.municipality_key
+        AVG(py.population) AS avg_population
+    FROM fact_population_yearly py
+    JOIN dim_municipality m ON py.municipality_key = m.municipality_key
     GROUP BY m.municipality_key, m.name
 ),
 sales_stats AS (
@@ -1,8 +1,12 @@
 -- Q9: Sales patterns between weekdays and weekends
+-- fact_sales has one row per product, store and day (lines of the same
+-- product sold in a store on one day are summed at load time), so the
+-- average is the daily sales of one product in one store, not of a single
+-- sales line.
 SELECT
     d.is_weekend,
     d.day_name,
-    AVG(fs.sales_amount) AS avg_daily_sales,
+    AVG(fs.sales_amount) AS avg_product_daily_sales,
     SUM(fs.sales_amount) AS total_sales
 FROM fact_sales fs
 JOIN dim_date d ON fs.date_key = d.date_key
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+
+def _group_codes(df, by):
+    """Returns (codes, groups) where codes maps each row to a group number."""
+    if not by:
+        return np.zeros(len(df), dtype=np.intp), pd.DataFrame(index=[0])
+    codes, uniques = pd.MultiIndex.from_frame(df[by]).factorize()
+    groups = uniques.to_frame(index=False)
+    groups.columns = by
+    return codes, groups
+
+
+def _pearson_by_code(codes, n_groups, x, y):
+    """
+    Pearson r for every group at once, from grouped sums of centered
+    products. Rows with a missing x or y are ignored.
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    codes, x, y = codes[valid], x[valid], y[valid]
+
+    n = np.bincount(codes, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.bincount(codes, weights=x, minlength=n_groups) / n
+        mean_y = np.bincount(codes, weights=y, minlength=n_groups) / n
+        dx = x - mean_x[codes]
+        dy = y - mean_y[codes]
+        sxy = np.bincount(codes, weights=dx * dy, minlength=n_groups)
+        sxx = np.bincount(codes, weights=dx * dx, minlength=n_groups)
+        syy = np.bincount(codes, weights=dy * dy, minlength=n_groups)
+        r = sxy / np.sqrt(sxx * syy)
+    r = np.clip(r, -1.0, 1.0)
+    r[n < 2] = np.nan
+    return n, r
+
+
+def p_values(r, n):
+    """Two-sided p-values for correlation coefficients r from n samples."""
+    # scipy is slow to import and only needed here
+    from scipy import stats
+
+    r = np.asarray(r, dtype=float)
+    df = np.asarray(n, dtype=float) - 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = r * np.sqrt(df / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(np.abs(t), df)
+    p = np.where(np.abs(r) == 1.0, 0.0, p)
+    # Two points always fit a line exactly; scipy reports p = 1 for them
+    p = np.where(df == 0, 1.0, p)
+    return np.where((df >= 0) & ~np.isnan(r), p, np.nan)
+
+
+def correlate(df, pairs, by=None, method='pearson'):
+    """
+    Computes correlations and p-values for every group in a single
+    vectorized pass.
+    - pairs: (x, y) column name tuples; a single tuple is also accepted.
+    - by: column name or list of column names to group on (e.g.
+      ['municipality_name', 'category', 'month_of_year']); None means the
+      whole frame is one group. Rows with a null group key are ignored.
+    - method: 'pearson' or 'spearman' (Pearson on within-group ranks).
+    Returns a tidy DataFrame with the group columns followed by
+    x, y, n, r and p_value; one row per group and pair.
+    """
+    if method not in ('pearson', 'spearman'):
+        raise ValueError(f"Unknown correlation method: {method}")
+    if isinstance(pairs, tuple):
+        pairs = [pairs]
+    if isinstance(by, str):
+        by = [by]
+    by = list(by or [])
+
+    if by:
+        # Rows with a null group key belong to no group
+        df = df.dropna(subset=by)
+    codes, groups = _group_codes(df, by)
+    n_groups = len(groups)
+    results = []
+    for x_col, y_col in pairs:
+        x = df[x_col].to_numpy(dtype=float, na_value=np.nan)
+        y = df[y_col].to_numpy(dtype=float, na_value=np.nan)
+        if method == 'spearman':
+            # Ranks are taken over the rows where both values exist
+            both = pd.DataFrame({'code': codes, 'x': x, 'y': y}).dropna()
+            ranked = both.groupby('code')[['x', 'y']].rank()
+            x = np.full(len(df), np.nan)
+            y = np.full(len(df), np.nan)
+            x[both.index] = ranked['x'].to_numpy()
+            y[both.index] = ranked['y'].to_numpy()
+
+        n, r = _pearson_by_code(codes, n_groups, x, y)
+        result = groups.copy()
+        result['x'] = x_col
+        result['y'] = y_col
+        result['n'] = n
+        result['r'] = r
+        result['p_value'] = p_values(r, n)
+        results.append(result)
+
+    return pd.concat(results, ignore_index=True)
+
+
+def random_group_intervals(estimate, replicates, sums, ratios=(), confidence=0.95):
+    """
+    Confidence intervals for estimates from a sample split into random
+    groups. estimate holds the full-sample result; replicates holds the same
+    query evaluated on each group alone (scaled up by the number of groups).
+    - sums: estimated columns that add up over rows (e.g. SUM(sales_amount));
+      a row missing from a replicate counts as 0 (an empty sum).
+    - ratios: estimated columns that do not (averages, per-capita figures); a
+      row missing from a replicate is left out and the interval uses the
+      replicates that have it (NaN with fewer than two).
+    The columns not listed identify rows and are never given an interval.
+    Returns estimate with a '<column>_ci' column (half-width of the interval)
+    after each estimated column.
+    """
+    from scipy import stats
+
+    sums, ratios = list(sums), list(ratios)
+    columns = sums + ratios
+    keys = [c for c in estimate.columns if c not in columns]
+    values = np.full((len(replicates), len(estimate), len(columns)), np.nan)
+    for g, replicate in enumerate(replicates):
+        if keys:
+            replicate = estimate[keys].merge(
+                replicate.drop_duplicates(keys), on=keys, how='left')
+        else:
+            replicate = replicate.reset_index(drop=True).reindex(range(len(estimate)))
+        values[g] = replicate[columns].to_numpy(dtype=float, na_value=np.nan)
+    values[:, :, :len(sums)] = np.nan_to_num(values[:, :, :len(sums)], nan=0.0)
+
+    # Variance of the full-sample estimate: s^2 of the group estimates / k,
+    # over the k groups that have the row
+    present = ~np.isnan(values)
+    k = present.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(present, values, 0.0).sum(axis=0) / k
+        squares = np.where(present, (values - mean) ** 2, 0.0).sum(axis=0)
+        spread = np.sqrt(squares / (k - 1) / k)
+        half_widths = stats.t.ppf(0.5 + confidence / 2, k - 1) * spread
+    half_widths[k < 2] = np.nan
+
+    result = estimate.copy()
+    for i, column in enumerate(columns):
+        result.insert(result.columns.get_loc(column) + 1, f'{column}_ci', half_widths[:, i])
+    return result
@@ -1,86 +1,276 @@
+import argparse
+import re
+import sys
+import numpy as np
 import pandas as pd
 import os
-from sqlalchemy import create_engine
-from scipy.stats import pearsonr
+from sqlalchemy import text
+import cli_options
+from analysis_stats import correlate, p_values, random_group_intervals
+from db import get_engine
 
-# Database connection parameters
-DB_HOST = "localhost"
-DB_NAME = "gold_db"
-DB_USER = "gold_user"
-DB_PASS = "gold_password"
-DB_PORT = "5432"
+head_rows = 25
 
-# Create a SQLAlchemy engine
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
+# Approximate mode for exploration (--sample). None runs the exact queries;
+# 'table' reads fact_sales_sample (stratified by month and store, built by
+# silver_to_gold.py), 'tablesample' reads a Bernoulli TABLESAMPLE of
+# fact_sales. Sums are scaled to estimate the full totals and every estimate
+# gets a confidence interval from the sample's random groups.
+sample_method = None
+SAMPLE_METHODS = cli_options.SAMPLE_METHODS
+TABLESAMPLE_PERCENT = cli_options.TABLESAMPLE_PERCENT
+TABLESAMPLE_REPLICATES = 10
+SAMPLE_CONFIDENCE = 0.95
 
-head_rows = 25
+# Estimated columns of each query over fact_sales, for the intervals of
+# analysis_stats.random_group_intervals: (sums, ratios). Other columns are
+# exact (tourism, population) or identify rows.
+SAMPLED_ESTIMATES = {
+    'q1_sales_per_capita.sql': (['total_sales'], ['sales_per_capita']),
+    'q2_sales_and_tourism.sql': (['total_sales'], []),
+    'q3_municipality_sales_tourism.sql': (['total_sales'], ['sales_per_capita']),
+    'q4_seasonality.sql': (['total_sales'], []),
+    'q5_product_category_location.sql': (['total_sales', 'total_units'], []),
+    'q6_store_performance.sql': (['total_sales', 'total_units_sold'], []),
+    'q8_population_vs_sales.sql': (['total_sales'], []),
+    'q9_weekday_weekend_sales.sql': (['total_sales'], ['avg_product_daily_sales']),
+    'q10_category_seasonal_tourism.sql': (['category_sales'], []),
+}
+
+FACT_SALES_PATTERN = re.compile(r'\bfact_sales\s+fs\b')
+AVG_PATTERN = re.compile(r'\bAVG\(fs\.(\w+)\)', re.IGNORECASE)
+
+def read_query_file(query_file_path):
+    """Reads an SQL query from a file."""
+    with open(query_file_path, 'r') as file:
+        return file.read()
+
+def is_sampled(query_file_path):
+    """True when approximate mode is on and the query reads fact_sales."""
+    return bool(sample_method) and bool(
+        FACT_SALES_PATTERN.search(read_query_file(query_file_path)))
+
+def sampled_sales_relation(replicate=None, replicates=None):
+    """
+    SQL standing in for fact_sales in approximate mode: the sampled rows with
+    sales_amount and units_sold multiplied by their weight, so SUMs estimate
+    the full totals. With replicate, only that random group is kept and its
+    weight is multiplied by the number of groups.
+    """
+    if sample_method == 'table':
+        source = "fact_sales_sample"
+        weight = "weight"
+        group = "replicate"
+    else:
+        source = (f"fact_sales TABLESAMPLE BERNOULLI ({TABLESAMPLE_PERCENT}) "
+                  f"REPEATABLE (0)")
+        weight = f"CAST({100.0 / TABLESAMPLE_PERCENT} AS DOUBLE PRECISION)"
+        group = f"MOD(sales_key, {replicates})"
+    where = ""
+    if replicate is not None:
+        weight = f"{weight} * {replicates}"
+        where = f" WHERE {group} = {replicate}"
+    return (f"SELECT date_key, store_key, product_key, "
+            f"sales_amount * {weight} AS sales_amount, "
+            f"units_sold * {weight} AS units_sold, "
+            f"{weight} AS weight FROM {source}{where}")
+
+def to_sampled_query(query, replicate=None, replicates=None):
+    """
+    Rewrites a query over 'fact_sales fs' to read the sample instead.
+    AVG(fs.x) becomes the weighted mean SUM(fs.x) / SUM(fs.weight).
+    """
+    relation = sampled_sales_relation(replicate, replicates)
+    query = FACT_SALES_PATTERN.sub(f"({relation}) fs", query)
+    return AVG_PATTERN.sub(r"(SUM(fs.\1) / NULLIF(SUM(fs.weight), 0))", query)
+
+def execute_sampled_query(query_file_path, intervals=True):
+    """
+    Executes a query from a file against the sample (see sample_method).
+    With intervals, it also runs once per random group of the sample and
+    adds a '<column>_ci' half-width after every estimated column listed in
+    SAMPLED_ESTIMATES.
+    """
+    df = pd.DataFrame()
+    try:
+        print(f"Executing query from {query_file_path} on the {sample_method} sample...")
+        query = read_query_file(query_file_path)
+        with get_engine().connect() as conn:
+            if sample_method == 'table':
+                replicates = conn.execute(
+                    text("SELECT MAX(replicate) + 1 FROM fact_sales_sample")).scalar()
+                if replicates is None:
+                    print("fact_sales_sample is empty; run silver_to_gold.py to build it.")
+                    return df
+            else:
+                replicates = TABLESAMPLE_REPLICATES
+            df = pd.read_sql(to_sampled_query(query), conn)
+            estimates = SAMPLED_ESTIMATES.get(os.path.basename(query_file_path))
+            if intervals and estimates is None:
+                print(f"No estimated columns listed for {query_file_path}; no intervals.")
+            elif intervals and not df.empty:
+                groups = [pd.read_sql(to_sampled_query(query, g, replicates), conn)
+                          for g in range(replicates)]
+                sums, ratios = estimates
+                df = random_group_intervals(df, groups, sums, ratios, SAMPLE_CONFIDENCE)
+        print("Query executed successfully.")
+    except Exception as e:
+        print(f"Error executing query from {query_file_path}: {e}")
+    return df
 
 def execute_query(query_file_path):
     """
     Executes an SQL query from a file and returns the results as a pandas DataFrame.
     """
+    if is_sampled(query_file_path):
+        return execute_sampled_query(query_file_path)
     df = pd.DataFrame()
     try:
         print(f"Executing query from {query_file_path}...")
-        with open(query_file_path, 'r') as file:
-            query = file.read()
-        df = pd.read_sql(query, engine)
+        query = read_query_file(query_file_path)
+        df = pd.read_sql(query, get_engine())
+        print("Query executed successfully.")
+    except Exception as e:
+        print(f"Error executing query from {query_file_path}: {e}")
+    return df
+
+def stream_query(query_file_path, chunksize=10000):
+    """
+    Executes an SQL query from a file through a named server-side cursor and
+    yields the results as DataFrames of at most chunksize rows. Only one chunk
+    is held in client memory at a time. In approximate mode, the sampled
+    result (with its intervals) is yielded as a single chunk.
+    """
+    if is_sampled(query_file_path):
+        yield execute_sampled_query(query_file_path)
+        return
+    print(f"Streaming query from {query_file_path}...")
+    query = read_query_file(query_file_path)
+    with get_engine().connect().execution_options(
+            stream_results=True, max_row_buffer=chunksize) as conn:
+        for chunk in pd.read_sql(text(query), conn, chunksize=chunksize):
+            yield chunk
+
+def execute_query_head(query_file_path, limit=head_rows):
+    """
+    Executes an SQL query from a file but only fetches its first `limit` rows,
+    in the query's own order. The total row count is computed by a separate
+    count query in the database, so the full result never leaves the server.
+    Returns (DataFrame, total_rows).
+    """
+    if is_sampled(query_file_path):
+        df = execute_sampled_query(query_file_path)
+        return df.head(limit), len(df)
+    df = pd.DataFrame()
+    total_rows = 0
+    try:
+        print(f"Executing query from {query_file_path} (first {limit} rows)...")
+        query = read_query_file(query_file_path).strip().rstrip(';')
+        with get_engine().connect() as conn:
+            # LIMIT on the query itself keeps its ORDER BY; an outer query
+            # over it (e.g. adding a window count) would not be guaranteed to
+            df = pd.read_sql(text(f"{query}\nLIMIT {int(limit)}"), conn)
+            total_rows = conn.execute(
+                text(f"SELECT COUNT(*) FROM (\n{query}\n) q")).scalar()
         print("Query executed successfully.")
     except Exception as e:
         print(f"Error executing query from {query_file_path}: {e}")
+    return df, total_rows
+
+def execute_correlation_query(query_file_path):
+    """
+    Executes a push-down correlation query (one row per group with n and r
+    computed by PostgreSQL) and adds the p-value for each row.
+    """
+    if is_sampled(query_file_path):
+        # Correlations of estimated sums; no intervals for r itself
+        df = execute_sampled_query(query_file_path, intervals=False)
+    else:
+        df = execute_query(query_file_path)
+    if not df.empty:
+        df['r'] = pd.to_numeric(df['r'])
+        df['p_value'] = p_values(df['r'], df['n'])
     return df
 
 def analyze_sales_per_capita():
     """
     Q1: Sales per capita over time.
     """
-    df_sales_per_capita = execute_query('analysis_queries/q1_sales_per_capita.sql')
+    df_sales_per_capita, total_rows = execute_query_head('analysis_queries/q1_sales_per_capita.sql')
     if not df_sales_per_capita.empty:
         print("\n--- Q1: Sales Per Capita Over Time ---")
-        print(df_sales_per_capita.head(head_rows))
-        print(f"\nTotal rows: {len(df_sales_per_capita)}")
-        print("\nSales per capita analysis complete. You can further analyze the 'df_sales_per_capita' DataFrame.")
+        print(df_sales_per_capita)
+        print(f"\nTotal rows: {total_rows}")
+        print("\nSales per capita analysis complete. Use stream_query() to process the full result in chunks.")
     else:
         print("\nNo data for sales per capita analysis.")
 
 def analyze_sales_and_tourism_correlation():
     """
-    Q2: Correlation between sales and tourism statistics.
+    Q2: Correlation between sales and tourism statistics. The result grows
+    with municipalities x months, so it is streamed and only the displayed
+    rows and the two correlated columns are kept.
     """
-    df_sales_tourism = execute_query('analysis_queries/q2_sales_and_tourism.sql')
-    if not df_sales_tourism.empty:
+    query_file_path = 'analysis_queries/q2_sales_and_tourism.sql'
+    head = pd.DataFrame()
+    pairs = []
+    try:
+        for chunk in stream_query(query_file_path):
+            if head.empty:
+                head = chunk.head(head_rows)
+            pairs.append(chunk[['total_sales', 'total_visitors']].astype(float))
+    except Exception as e:
+        print(f"Error executing query from {query_file_path}: {e}")
+        pairs = []
+    if pairs and not head.empty:
+        df_sales_tourism = pd.concat(pairs, ignore_index=True)
         print("\n--- Q2: Sales and Tourism Data ---")
-        print(df_sales_tourism.head(head_rows))
+        print(head)
         print(f"\nTotal rows: {len(df_sales_tourism)}")
 
-        # Calculate correlation
-        if 'total_sales' in df_sales_tourism.columns and 'total_visitors' in df_sales_tourism.columns:
-            correlation = df_sales_tourism['total_sales'].corr(df_sales_tourism['total_visitors'])
-            print(f"\nCorrelation between Total Sales and Total Visitors: {correlation:.4f}")
-            print("\nSales and tourism correlation analysis complete. You can further analyze the 'df_sales_tourism' DataFrame.")
-        else:
-            print("\nCannot calculate correlation: 'total_sales' or 'total_visitors' column not found.")
+        result = correlate(df_sales_tourism, ('total_sales', 'total_visitors')).iloc[0]
+        print(f"\nCorrelation between Total Sales and Total Visitors: {result['r']:.4f}, p-value={result['p_value']:.4f}")
+        print("\nSales and tourism correlation analysis complete.")
     else:
         print("\nNo data for sales and tourism correlation analysis.")
 
-def analyze_municipality_sales_tourism():
+def municipality_sales_tourism_correlation(pushdown=False):
     """
-    Q3: Municipalities with highest sales per capita and tourism relation.
+    Q3 correlations of sales per capita with tourism visitors and revenue.
+    With pushdown, PostgreSQL computes them and only two rows are transferred.
     """
+    if pushdown:
+        return execute_correlation_query('analysis_queries/q3_municipality_sales_tourism_corr.sql')
     df = execute_query('analysis_queries/q3_municipality_sales_tourism.sql')
-    if not df.empty:
+    if df.empty:
+        return df
+    return correlate(df, [('sales_per_capita', 'total_visitors'),
+                          ('sales_per_capita', 'total_tourism_revenue')])
+
+def analyze_municipality_sales_tourism(pushdown=False):
+    """
+    Q3: Municipalities with highest sales per capita and tourism relation.
+    """
+    if pushdown:
+        result = municipality_sales_tourism_correlation(pushdown=True)
+        if result.empty:
+            print("\nNo data for Q3 analysis.")
+            return
+        print("\n--- Q3: Municipalities - Sales Per Capita & Tourism (computed in database) ---")
+    else:
+        df = execute_query('analysis_queries/q3_municipality_sales_tourism.sql')
+        if df.empty:
+            print("\nNo data for Q3 analysis.")
+            return
         print("\n--- Q3: Municipalities - Sales Per Capita & Tourism ---")
         print(df.head(head_rows))
-        
-        # Simple correlation check
-        if 'sales_per_capita' in df.columns and 'total_visitors' in df.columns:
-            corr_visitors = df['sales_per_capita'].corr(df['total_visitors'])
-            corr_revenue = df['sales_per_capita'].corr(df['total_tourism_revenue'])
-            print(f"\nCorrelation (Sales Per Capita vs. Total Visitors): {corr_visitors:.4f}")
-            print(f"Correlation (Sales Per Capita vs. Total Tourism Revenue): {corr_revenue:.4f}")
-    else:
-        print("\nNo data for Q3 analysis.")
+        result = correlate(df, [('sales_per_capita', 'total_visitors'),
+                                ('sales_per_capita', 'total_tourism_revenue')])
+
+    # Simple correlation check
+    corr_visitors, corr_revenue = result.itertuples(index=False)
+    print(f"\nCorrelation (Sales Per Capita vs. Total Visitors): {corr_visitors.r:.4f}, p-value={corr_visitors.p_value:.4f}")
+    print(f"Correlation (Sales Per Capita vs. Total Tourism Revenue): {corr_revenue.r:.4f}, p-value={corr_revenue.p_value:.4f}")
 
 def analyze_seasonality():
     """
@@ -97,10 +287,11 @@ def analyze_product_category_location():
     """
     Q5: Product category performance across municipalities.
     """
-    df = execute_query('analysis_queries/q5_product_category_location.sql')
+    df, total_rows = execute_query_head('analysis_queries/q5_product_category_location.sql')
     if not df.empty:
         print("\n--- Q5: Product Category Performance by Municipality ---")
-        print(df.head(head_rows))
+        print(df)
+        print(f"\nTotal rows: {total_rows}")
     else:
         print("\nNo data for Q5 analysis.")
 
@@ -108,10 +299,11 @@ def analyze_store_performance():
     """
     Q6: Top performing stores.
     """
-    df = execute_query('analysis_queries/q6_store_performance.sql')
+    df, total_rows = execute_query_head('analysis_queries/q6_store_performance.sql')
     if not df.empty:
         print("\n--- Q6: Top Performing Stores ---")
-        print(df.head(head_rows))
+        print(df)
+        print(f"\nTotal rows: {total_rows}")
     else:
         print("\nNo data for Q6 analysis.")
 
@@ -119,10 +311,11 @@ def analyze_tourism_trends():
     """
     Q7: Tourism revenue change over time by municipality.
     """
-    df = execute_query('analysis_queries/q7_tourism_trends.sql')
+    df, total_rows = execute_query_head('analysis_queries/q7_tourism_trends.sql')
     if not df.empty:
         print("\n--- Q7: Tourism Revenue Trends by Municipality ---")
-        print(df.head(head_rows))
+        print(df)
+        print(f"\nTotal rows: {total_rows}")
     else:
         print("\nNo data for Q7 analysis.")
 
@@ -135,8 +328,8 @@ def analyze_population_sales():
         print("\n--- Q8: Population vs. Total Grocery Sales ---")
         print(df)
         if 'avg_population' in df.columns and 'total_sales' in df.columns:
-            correlation = df['avg_population'].corr(df['total_sales'])
-            print(f"\nCorrelation (Population vs. Total Sales): {correlation:.4f}")
+            result = correlate(df, ('avg_population', 'total_sales')).iloc[0]
+            print(f"\nCorrelation (Population vs. Total Sales): {result['r']:.4f}, p-value={result['p_value']:.4f}")
     else:
         print("\nNo data for Q8 analysis.")
 
@@ -151,36 +344,93 @@ def analyze_weekday_weekend():
     else:
         print("\nNo data for Q9 analysis.")
 
-def analyze_category_seasonal_tourism():
+def category_seasonal_tourism_correlation(pushdown=False):
     """
-    Q10: Product category sales correlate with tourism seasons.
+    Q10 correlation per product category of monthly sales with tourism
+    visitors. With pushdown, PostgreSQL computes it with corr()/regr_count()
+    and only one row per category is transferred.
     """
+    if pushdown:
+        return execute_correlation_query('analysis_queries/q10_category_seasonal_tourism_corr.sql')
     df = execute_query('analysis_queries/q10_category_seasonal_tourism.sql')
-    if not df.empty:
+    if df.empty:
+        return df
+    # Correlation per category, computed for all categories in one call
+    return correlate(df, ('category_sales', 'total_visitors'), by='category')
+
+def analyze_category_seasonal_tourism(pushdown=False):
+    """
+    Q10: Product category sales correlate with tourism seasons.
+    """
+    result = category_seasonal_tourism_correlation(pushdown)
+    if not result.empty:
         print("\n--- Q10: Product Category Sales vs. Tourism Seasonality ---")
-        # To see correlation per category, we can group by category
-        categories = df['category'].unique()
         print("\nCorrelation between Monthly Category Sales and Total Tourism Visitors:")
-        for cat in categories:
-            cat_df = df[df['category'] == cat]
-            if len(cat_df) > 1: # Need at least 2 points for correlation
-                corr, p_value = pearsonr(cat_df['category_sales'], cat_df['total_visitors'])
-                print(f"  {cat}: Correlation={corr:.4f}, p-value={p_value:.4f}")
-                if p_value < 0.05:
+        for row in result.itertuples(index=False):
+            if row.n > 1: # Need at least 2 points for correlation
+                print(f"  {row.category}: Correlation={row.r:.4f}, p-value={row.p_value:.4f}")
+                if row.p_value < 0.05:
                     print(f"    -> Significant at p < 0.05")
             else:
-                print(f"  {cat}: Not enough data")
+                print(f"  {row.category}: Not enough data")
     else:
         print("\nNo data for Q10 analysis.")
 
-if __name__ == "__main__":
+def verify_pushdown():
+    """
+    Cross-validates the push-down correlations against the client-side ones
+    for Q3 and Q10. Returns True when n, r and p-values agree.
+    """
+    checks = [
+        ('Q3', municipality_sales_tourism_correlation, ['x', 'y']),
+        ('Q10', category_seasonal_tourism_correlation, ['category', 'x', 'y']),
+    ]
+    all_ok = True
+    for name, compute, keys in checks:
+        client = compute(pushdown=False)
+        server = compute(pushdown=True)
+        merged = client.merge(server, on=keys, how='outer',
+                              suffixes=('_client', '_server'), indicator=True)
+        ok = (
+            (merged['_merge'] == 'both').all()
+            and (merged['n_client'] == merged['n_server']).all()
+            and np.allclose(merged['r_client'], merged['r_server'], equal_nan=True)
+            and np.allclose(merged['p_value_client'], merged['p_value_server'], equal_nan=True)
+        )
+        print(f"{name}: {len(merged)} correlations compared - {'OK' if ok else 'MISMATCH'}")
+        if not ok:
+            print(merged)
+        all_ok = all_ok and ok
+    return all_ok
+
+def main(pushdown=False, sample=None):
+    """
+    Runs all analyses. With sample ('table' or 'tablesample'), queries over
+    fact_sales return estimates with confidence intervals instead of exact
+    results.
+    """
+    global sample_method
+    sample_method = sample
+    if sample:
+        print(f"Approximate mode ({sample}): sales figures are estimates; "
+              f"'_ci' columns hold the {SAMPLE_CONFIDENCE:.0%} confidence interval half-widths.")
     analyze_sales_per_capita()
     analyze_sales_and_tourism_correlation()
-    analyze_municipality_sales_tourism()
+    analyze_municipality_sales_tourism(pushdown=pushdown)
     analyze_seasonality()
     analyze_product_category_location()
     analyze_store_performance()
     analyze_tourism_trends()
     analyze_population_sales()
     analyze_weekday_weekend()
-    analyze_category_seasonal_tourism()
+    analyze_category_seasonal_tourism(pushdown=pushdown)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the gold layer analysis queries.")
+    cli_options.add_analyze_arguments(parser)
+    args = parser.parse_args()
+
+    if args.verify_pushdown:
+        sys.exit(0 if verify_pushdown() else 1)
+    TABLESAMPLE_PERCENT = args.sample_percent
+    main(pushdown=args.pushdown, sample=args.sample)
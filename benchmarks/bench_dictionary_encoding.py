@@ -0,0 +1,101 @@
+"""
+Compares the dictionary-encoded fact_tourism/fact_demographics (SMALLINT keys
+into dim_accommodation_type, dim_origin_country, dim_age_group, dim_gender)
+with the previous VARCHAR layout, rebuilt here as temporary tables.
+
+Load a benchmark dataset into the gold layer first (generate_bronze_data.py,
+pipeline.py silver, pipeline.py gold), then run:
+    python benchmarks/bench_dictionary_encoding.py [--repeat 5]
+"""
+import argparse
+import os
+import sys
+
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from db import get_engine  # noqa: E402
+
+VARCHAR_TABLES = {
+    'fact_tourism_varchar': """
+        SELECT ft.tourism_key, ft.date_key, ft.municipality_key,
+               a.name::varchar(50) AS accommodation_type,
+               o.name::varchar(100) AS origin_country,
+               ft.visitor_count, ft.revenue
+        FROM fact_tourism ft
+        JOIN dim_accommodation_type a ON ft.accommodation_type_key = a.accommodation_type_key
+        JOIN dim_origin_country o ON ft.origin_country_key = o.origin_country_key
+    """,
+    'fact_demographics_varchar': """
+        SELECT fd.demographics_key, fd.date_key, fd.municipality_key,
+               ag.name::varchar(20) AS age_group,
+               g.name::varchar(20) AS gender,
+               fd.population_count
+        FROM fact_demographics fd
+        JOIN dim_age_group ag ON fd.age_group_key = ag.age_group_key
+        JOIN dim_gender g ON fd.gender_key = g.gender_key
+    """,
+}
+
+# (label, encoded query, varchar query) doing the same group-by. The encoded
+# queries group on the SMALLINT keys and only join the names to the result.
+QUERIES = [
+    ('tourism by accommodation type and country',
+     """SELECT a.name, o.name, t.visitors
+        FROM (SELECT accommodation_type_key, origin_country_key, SUM(visitor_count) AS visitors
+              FROM fact_tourism
+              GROUP BY accommodation_type_key, origin_country_key) t
+        JOIN dim_accommodation_type a ON t.accommodation_type_key = a.accommodation_type_key
+        JOIN dim_origin_country o ON t.origin_country_key = o.origin_country_key""",
+     """SELECT accommodation_type, origin_country, SUM(visitor_count)
+        FROM fact_tourism_varchar
+        GROUP BY accommodation_type, origin_country"""),
+    ('population by age group and gender',
+     """SELECT ag.name, g.name, p.population
+        FROM (SELECT age_group_key, gender_key, SUM(population_count) AS population
+              FROM fact_demographics
+              GROUP BY age_group_key, gender_key) p
+        JOIN dim_age_group ag ON p.age_group_key = ag.age_group_key
+        JOIN dim_gender g ON p.gender_key = g.gender_key""",
+     """SELECT age_group, gender, SUM(population_count)
+        FROM fact_demographics_varchar
+        GROUP BY age_group, gender"""),
+]
+
+
+def execution_ms(conn, query, repeat):
+    """Best server-side execution time of the query over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}")).scalar()
+        ms = plan[0]['Execution Time']
+        best = ms if best is None else min(best, ms)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with get_engine().connect() as conn:
+        for name, query in VARCHAR_TABLES.items():
+            conn.execute(text(f"CREATE TEMP TABLE {name} AS {query}"))
+            conn.execute(text(f"ANALYZE {name}"))
+
+        print(f"{'table':<28}{'rows':>12}{'avg row bytes':>15}{'size MB':>10}")
+        for table in ['fact_tourism', 'fact_tourism_varchar',
+                      'fact_demographics', 'fact_demographics_varchar']:
+            rows, width, size = conn.execute(text(
+                f"SELECT COUNT(*), AVG(pg_column_size(t.*)), "
+                f"pg_relation_size('{table}') FROM {table} t")).one()
+            print(f"{table:<28}{rows:>12}{float(width or 0):>15.1f}{size / 2**20:>10.2f}")
+
+        print(f"\n{'query':<44}{'encoded ms':>12}{'varchar ms':>12}")
+        for label, encoded, varchar in QUERIES:
+            print(f"{label:<44}{execution_ms(conn, encoded, args.repeat):>12.2f}"
+                  f"{execution_ms(conn, varchar, args.repeat):>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
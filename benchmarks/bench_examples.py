@@ -0,0 +1,95 @@
+"""
+Compares the dict-loop aggregations the examples used to do with the
+streamed, vectorized versions in examples/aggregations.py.
+
+Generate data first, e.g.:
+    python generate_bronze_data.py --output bench/bronze --start-year 2022 --end-year 2023
+    python benchmarks/bench_examples.py --bronze bench/bronze
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'examples'))
+import aggregations  # noqa: E402
+
+
+def dict_loop_municipality(sales_files, stores_path):
+    """The original ex2.py logic, extended to several files."""
+    with open(stores_path, 'r') as f:
+        stores = {s['store_id']: s for s in json.load(f)}
+    monthly_sales = defaultdict(float)
+    for path in sales_files:
+        with open(path, 'r') as f:
+            sales = json.load(f)
+        for sale in sales:
+            store = stores[sale['store_id']]
+            year, month = sale['date'][:7].split('-')
+            monthly_sales[(store['municipality_code'], year, month)] += sale['sales_amount']
+    return monthly_sales
+
+
+def dict_loop_category(sales_files, products_path):
+    """The original ex4.py logic, extended to several files."""
+    with open(products_path, 'r') as f:
+        products = {p['product_id']: p for p in json.load(f)}
+    category_sales = defaultdict(float)
+    for path in sales_files:
+        with open(path, 'r') as f:
+            sales = json.load(f)
+        for sale in sales:
+            category_sales[products[sale['product_id']]['product_category']] += sale['sales_amount']
+    return category_sales
+
+
+def run(name, bronze):
+    """Runs one variant; executed in a fresh process so peak RSS is its own."""
+    sales_files = sorted(glob.glob(os.path.join(bronze, 'grocery', 'grocery_sales_*.json')))
+    stores_path = os.path.join(bronze, 'grocery', 'stores.json')
+    products_path = os.path.join(bronze, 'grocery', 'products.json')
+
+    start = time.perf_counter()
+    if name == 'dict municipality':
+        result = dict_loop_municipality(sales_files, stores_path)
+        total = sum(result.values())
+    elif name == 'dict category':
+        result = dict_loop_category(sales_files, products_path)
+        total = sum(result.values())
+    elif name == 'vectorized municipality':
+        total = aggregations.monthly_sales_by_municipality(
+            sales_files, stores_path)['sales_amount'].sum()
+    else:
+        total = aggregations.sales_by_category(
+            sales_files, products_path)['sales_amount'].sum()
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return elapsed, peak_mb, float(total)
+
+
+def count_rows(bronze):
+    rows = 0
+    for path in glob.glob(os.path.join(bronze, 'grocery', 'grocery_sales_*.json')):
+        for batch in aggregations.iter_json_array(path):
+            rows += len(batch)
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--bronze', default='bronze')
+    args = parser.parse_args()
+
+    rows = count_rows(args.bronze)
+    print(f"{rows} sales rows\n")
+    print(f"{'variant':<26}{'seconds':>10}{'rows/s':>14}{'peak MB':>10}{'total':>18}")
+    for name in ['dict municipality', 'vectorized municipality',
+                 'dict category', 'vectorized category']:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            elapsed, peak_mb, total = executor.submit(run, name, args.bronze).result()
+        print(f"{name:<26}{elapsed:>10.2f}{rows / elapsed:>14,.0f}{peak_mb:>10.0f}{total:>18.2f}")
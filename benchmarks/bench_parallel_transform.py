@@ -0,0 +1,112 @@
+"""
+Measures the speedup of the chunked-parallel silver transform
+(parallel_transform.run_partitioned) against the number of worker processes,
+and the vectorized cost of living date construction against the row-wise
+apply it replaced.
+
+The tourism input is the generated bronze file repeated --copies times, to
+approximate daily tourism data per origin country. Generate data first, e.g.:
+    python generate_bronze_data.py --output bench/bronze --start-year 2022 --end-year 2023
+    python benchmarks/bench_parallel_transform.py --bronze bench/bronze --copies 200
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import parallel_transform  # noqa: E402
+import process_to_silver  # noqa: E402
+
+
+def build_input(bronze, copies, work_dir):
+    """Writes the bronze tourism file repeated `copies` times (one header)."""
+    source = os.path.join(bronze, 'tourism', 'tourism_data.csv')
+    path = os.path.join(work_dir, 'tourism_data.csv')
+    with open(source, 'rb') as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith(b'\n'):
+        body += b'\n'
+    with open(path, 'wb') as f:
+        f.write(header)
+        for _ in range(copies):
+            f.write(body)
+    return path, copies * body.count(b'\n')
+
+
+def time_workers(input_path, work_dir, workers, part_mb):
+    start = time.perf_counter()
+    parallel_transform.run_partitioned(
+        input_path, work_dir, 'tourism', process_to_silver.transform_tourism,
+        rules=process_to_silver.TOURISM_RULES, part_mb=part_mb,
+        max_workers=workers, encoding='utf-8')
+    return time.perf_counter() - start
+
+
+def compare_date_construction(bronze, rows):
+    """Row-wise apply (the previous process_cost_of_living) vs vectorized."""
+    source = pd.read_csv(os.path.join(bronze, 'costofliving', 'costofliving.csv'))
+    df = pd.concat([source] * max(1, rows // len(source)), ignore_index=True)
+
+    start = time.perf_counter()
+    old = df.copy()
+    old['month_num'] = old['month'].map(process_to_silver.MONTH_MAP)
+    old['year_int'] = pd.to_numeric(old['year'])
+    old_dates = old.apply(
+        lambda x: f"{int(x['year_int'])}-{int(x['month_num']):02d}-01", axis=1)
+    apply_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_dates = process_to_silver.transform_cost_of_living(df.copy())['date']
+    vectorized_seconds = time.perf_counter() - start
+
+    assert old_dates.tolist() == new_dates.tolist()
+    return len(df), apply_seconds, vectorized_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bronze', default=os.path.join('bench', 'bronze'))
+    parser.add_argument('--copies', type=int, default=100,
+                        help="How many times to repeat the tourism file")
+    parser.add_argument('--part-mb', type=float, default=16)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help="Worker counts to try (default: 1, 2, 4, ... up to the core count)")
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    workers = args.workers or sorted({1, *[2 ** i for i in range(1, 4) if 2 ** i <= cpu_count],
+                                      cpu_count})
+
+    work_dir = tempfile.mkdtemp(prefix='bench_parallel_')
+    try:
+        input_path, rows = build_input(args.bronze, args.copies, work_dir)
+        size_mb = os.path.getsize(input_path) / 1024 / 1024
+        print(f"Tourism input: {rows} rows, {size_mb:.0f} MB, {cpu_count} core(s)\n")
+
+        results = []
+        for n in workers:
+            seconds = time_workers(input_path, work_dir, n, args.part_mb)
+            results.append((n, seconds))
+
+        baseline = results[0][1]
+        print(f"\n{'workers':>8} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+        for n, seconds in results:
+            print(f"{n:>8} {seconds:>9.2f} {rows / seconds:>12,.0f} {baseline / seconds:>7.2f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    n, apply_seconds, vectorized_seconds = compare_date_construction(args.bronze, rows)
+    print(f"\nCost of living date column for {n} rows: "
+          f"apply {apply_seconds:.2f}s, vectorized {vectorized_seconds:.3f}s "
+          f"({apply_seconds / vectorized_seconds:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
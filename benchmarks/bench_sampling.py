@@ -0,0 +1,75 @@
+"""
+Compares the approximate analysis mode (analyze_data.py --sample) with the
+exact queries: run time, relative error of the estimates and how often the
+exact value falls inside the reported confidence interval.
+
+Load the gold layer first (silver_to_gold.py builds fact_sales_sample), then:
+    python benchmarks/bench_sampling.py
+    python benchmarks/bench_sampling.py --method tablesample --percent 2
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import analyze_data  # noqa: E402
+
+QUERIES = [
+    'analysis_queries/q4_seasonality.sql',
+    'analysis_queries/q5_product_category_location.sql',
+    'analysis_queries/q6_store_performance.sql',
+    'analysis_queries/q9_weekday_weekend_sales.sql',
+    'analysis_queries/q10_category_seasonal_tourism.sql',
+]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def compare(query_file_path, method):
+    """Returns (exact seconds, sampled seconds, estimates, median error, coverage)."""
+    analyze_data.sample_method = None
+    exact, exact_seconds = timed(analyze_data.execute_query, query_file_path)
+    analyze_data.sample_method = method
+    sampled, sampled_seconds = timed(analyze_data.execute_sampled_query, query_file_path)
+
+    estimated = [c[:-len('_ci')] for c in sampled.columns if c.endswith('_ci')]
+    keys = [c for c in sampled.columns if c not in estimated and not c.endswith('_ci')]
+    merged = exact.merge(sampled, on=keys, suffixes=('_exact', ''))
+    errors, covered = [], []
+    for column in estimated:
+        truth = merged[f'{column}_exact'].astype(float).to_numpy()
+        estimate = merged[column].to_numpy(dtype=float)
+        ci = merged[f'{column}_ci'].to_numpy(dtype=float)
+        errors.append(np.abs(estimate - truth) / np.abs(truth))
+        covered.append(np.abs(estimate - truth) <= ci)
+    errors = np.concatenate(errors) if errors else np.array([np.nan])
+    covered = np.concatenate(covered) if covered else np.array([np.nan])
+    return exact_seconds, sampled_seconds, errors.size, np.median(errors), np.mean(covered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--method', choices=analyze_data.SAMPLE_METHODS, default='table')
+    parser.add_argument('--percent', type=float, default=analyze_data.TABLESAMPLE_PERCENT,
+                        help="Sample percentage for --method tablesample")
+    args = parser.parse_args()
+    analyze_data.TABLESAMPLE_PERCENT = args.percent
+
+    results = [(path, *compare(path, args.method)) for path in QUERIES]
+    print(f"\n{'query':<34} {'exact s':>8} {'sample s':>9} {'estimates':>10} "
+          f"{'median err':>11} {'CI coverage':>12}")
+    for path, exact_s, sampled_s, n, error, coverage in results:
+        print(f"{os.path.basename(path):<34} {exact_s:>8.2f} {sampled_s:>9.2f} {n:>10} "
+              f"{error:>10.1%} {coverage:>11.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Compares the silver codecs (silver_io.CODECS): write time (one process and
+parts written by parallel workers), read time and size on disk.
+
+Uses the silver grocery sales as test data. Generate and process data first, e.g.:
+    python generate_bronze_data.py --output bench/bronze --start-year 2022 --end-year 2023
+    python benchmarks/bench_silver_codecs.py --silver silver
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import parallel_transform  # noqa: E402
+import silver_io  # noqa: E402
+
+
+def write_part(args):
+    df, path, codec = args
+    df.to_csv(path, index=False, encoding='utf-8', compression=silver_io.CODECS[codec][1])
+
+
+def bench_codec(df, codec, work_dir, parts, workers):
+    """Returns (serial write s, parallel write s, read s, size MB)."""
+    codec_dir = os.path.join(work_dir, codec)
+    os.makedirs(codec_dir)
+
+    start = time.perf_counter()
+    single = silver_io.write_csv(df, os.path.join(codec_dir, 'single'), codec)
+    serial_seconds = time.perf_counter() - start
+
+    part_dir = os.path.join(codec_dir, 'parts')
+    silver_io.prepare_part_dir(part_dir)
+    slices = np.array_split(np.arange(len(df)), parts)
+    tasks = [(df.iloc[rows], silver_io.part_path(part_dir, i, codec), codec)
+             for i, rows in enumerate(slices)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(write_part, tasks))
+    parallel_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read_rows = len(silver_io.read_dataset(part_dir, encoding='utf-8'))
+    read_seconds = time.perf_counter() - start
+    assert read_rows == len(df)
+
+    return serial_seconds, parallel_seconds, read_seconds, os.path.getsize(single) / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--silver', default='silver')
+    parser.add_argument('--parts', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=parallel_transform.default_workers())
+    args = parser.parse_args()
+
+    df = silver_io.read_dataset(os.path.join(args.silver, 'grocery_sales'), encoding='utf-8')
+    codecs = []
+    for codec in silver_io.CODECS:
+        try:
+            silver_io.check_codec(codec)
+            codecs.append(codec)
+        except ImportError as e:
+            print(f"Skipping {codec}: {e}")
+
+    work_dir = tempfile.mkdtemp(prefix='bench_codecs_')
+    try:
+        print(f"{len(df)} sales rows, {args.parts} parts, {args.workers} worker(s), "
+              f"{os.cpu_count()} core(s)\n")
+        print(f"{'codec':<6} {'write s':>8} {'parallel write s':>17} {'read s':>7} "
+              f"{'size MB':>8} {'ratio':>6}")
+        baseline = None
+        for codec in codecs:
+            serial_s, parallel_s, read_s, size_mb = bench_codec(
+                df, codec, work_dir, args.parts, args.workers)
+            baseline = baseline or size_mb
+            print(f"{codec:<6} {serial_s:>8.2f} {parallel_s:>17.2f} {read_s:>7.2f} "
+                  f"{size_mb:>8.1f} {baseline / size_mb:>5.1f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
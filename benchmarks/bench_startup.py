@@ -0,0 +1,63 @@
+"""
+Measures CLI startup cost with `python -X importtime`: the total import
+time of each pipeline.py --help call and of each stage module.
+
+    python benchmarks/bench_startup.py
+
+tests/test_startup.py checks that --help imports no heavy library.
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+from cli_options import HEAVY_MODULES  # noqa: E402
+
+HELP_COMMANDS = [
+    ['--help'],
+    ['fetch', '--help'],
+    ['silver', '--help'],
+    ['gold', '--help'],
+    ['analyze', '--help'],
+]
+
+# Stage modules, imported directly, to show what each subcommand pays once it runs
+STAGE_MODULES = ['process_to_silver', 'create_gold_tables', 'silver_to_gold', 'analyze_data']
+
+
+def import_profile(python_args):
+    """
+    Runs python -X importtime with the given arguments and returns
+    (total import microseconds, set of top-level packages imported).
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + python_args,
+        cwd=ROOT, capture_output=True, text=True)
+    total_us = 0
+    packages = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        packages.add(name.strip().split('.')[0])
+    return total_us, packages
+
+
+def main():
+    print(f"{'command':<36}{'import ms':>10}  heavy modules")
+    for command in HELP_COMMANDS:
+        total_us, packages = import_profile(['pipeline.py'] + command)
+        heavy = sorted(packages & HEAVY_MODULES)
+        label = 'pipeline.py ' + ' '.join(command)
+        print(f"{label:<36}{total_us / 1000:>10.1f}  {', '.join(heavy) or '-'}")
+
+    print(f"\n{'stage module':<36}{'import ms':>10}")
+    for module in STAGE_MODULES:
+        total_us, _ = import_profile(['-c', f'import {module}'])
+        print(f"{module:<36}{total_us / 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Command line options shared by pipeline.py and the stage scripts, so their
+choices and defaults are declared once. Only the standard library is
+imported here: pipeline.py uses this module to build its parser without
+loading pandas.
+"""
+
+# Silver codecs: file extension and pandas compression options (used by
+# silver_io). gzip level 1 keeps most of the size reduction at a fraction of
+# the default level's cost; zstd needs the optional zstandard package.
+CODECS = {
+    'none': ('.csv', None),
+    'gzip': ('.csv.gz', {'method': 'gzip', 'compresslevel': 1}),
+    'zstd': ('.csv.zst', {'method': 'zstd', 'level': 3}),
+}
+
+# Approximate analysis (analyze_data.py --sample)
+SAMPLE_METHODS = ['table', 'tablesample']
+TABLESAMPLE_PERCENT = 1.0
+
+# Libraries pipeline.py must not import for --help (checked by
+# tests/test_startup.py, timed by benchmarks/bench_startup.py)
+HEAVY_MODULES = {'pandas', 'numpy', 'scipy', 'sqlalchemy', 'psycopg2', 'requests'}
+
+
+def add_silver_arguments(parser):
+    """Options of the bronze to silver step (process_to_silver.py, pipeline.py silver)."""
+    parser.add_argument('--codec', choices=list(CODECS),
+                        help="Compression of the silver files (default: SILVER_CODEC or gzip)")
+
+
+def add_analyze_arguments(parser):
+    """Options of the analysis step (analyze_data.py, pipeline.py analyze)."""
+    parser.add_argument('--pushdown', action='store_true',
+                        help="Compute Q3 and Q10 correlations in PostgreSQL")
+    parser.add_argument('--verify-pushdown', action='store_true',
+                        help="Compare push-down and client-side correlations and exit")
+    parser.add_argument('--sample', nargs='?', const=SAMPLE_METHODS[0], choices=SAMPLE_METHODS,
+                        help="Estimate sales figures from fact_sales_sample (default) "
+                             "or a TABLESAMPLE of fact_sales, with confidence intervals")
+    parser.add_argument('--sample-percent', type=float, default=TABLESAMPLE_PERCENT,
+                        help="Percentage of fact_sales rows read by --sample tablesample")
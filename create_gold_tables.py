@@ -1,21 +1,19 @@
 import os
 import psycopg2
-from psycopg2 import sql
+import sqlalchemy.exc
+
+from db import get_raw_connection
 
 
 def get_db_connection():
-    """Establishes a connection to the PostgreSQL database."""
+    """Borrows a connection to the PostgreSQL database from the shared pool."""
     try:
-        conn = psycopg2.connect(
-            host=os.environ.get("POSTGRES_HOST", "localhost"),
-            dbname=os.environ.get("POSTGRES_DB", "gold_db"),
-            user=os.environ.get("POSTGRES_USER", "gold_user"),
-            password=os.environ.get("POSTGRES_PASSWORD", "gold_password"),
-            port=os.environ.get("POSTGRES_PORT", "5432")
-        )
+        conn = get_raw_connection()
         print("Database connection established successfully.")
         return conn
-    except psycopg2.OperationalError as e:
+    # Engine.raw_connection() raises the psycopg2 error itself; the pool's
+    # pre-ping can raise the SQLAlchemy wrapper
+    except (psycopg2.OperationalError, sqlalchemy.exc.OperationalError) as e:
         print(f"Could not connect to the database: {e}")
         return None
 
@@ -50,10 +48,17 @@ def main():
         "dim_date.sql",
         "dim_product.sql",
         "dim_store.sql",
+        "dim_accommodation_type.sql",
+        "dim_origin_country.sql",
+        "dim_age_group.sql",
+        "dim_gender.sql",
         # Facts
         "fact_sales.sql",
+        "fact_sales_sample.sql",
         "fact_tourism.sql",
         "fact_demographics.sql",
+        "fact_population_yearly.sql",
+        "fact_population_monthly.sql",
         "fact_costofliving.sql",
         # Indexes (performance optimization)
         "indexes.sql"
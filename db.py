@@ -0,0 +1,77 @@
+import os
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
+
+# --- CONFIGURATION ---
+
+# Database connection details from environment variables or defaults
+DB_USER = os.environ.get("POSTGRES_USER", "gold_user")
+DB_PASSWORD = os.environ.get("POSTGRES_PASSWORD", "gold_password")
+DB_HOST = os.environ.get("POSTGRES_HOST", "localhost")
+DB_PORT = os.environ.get("POSTGRES_PORT", "5432")
+DB_NAME = os.environ.get("POSTGRES_DB", "gold_db")
+
+# Connection pool settings
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+POOL_RECYCLE_SECONDS = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+
+# Session settings. Analysis queries are capped so a runaway query cannot hold
+# a pooled connection forever; loads get more sort/hash memory. Commits of the
+# load profile (schema DDL, dimensions) wait for the WAL flush unless
+# DB_LOAD_SYNCHRONOUS_COMMIT=off is set; the fact_sales merge turns it off for
+# its own transactions only (see silver_to_gold.populate_fact_sales).
+STATEMENT_TIMEOUT = os.environ.get("DB_STATEMENT_TIMEOUT", "15min")
+LOAD_WORK_MEM = os.environ.get("DB_LOAD_WORK_MEM", "256MB")
+LOAD_SYNCHRONOUS_COMMIT = os.environ.get("DB_LOAD_SYNCHRONOUS_COMMIT", "on")
+
+SESSION_SETTINGS = {
+    'analysis': {'statement_timeout': STATEMENT_TIMEOUT},
+    'load': {'statement_timeout': '0',
+             'work_mem': LOAD_WORK_MEM,
+             'synchronous_commit': LOAD_SYNCHRONOUS_COMMIT},
+}
+
+_engines = {}
+
+
+def get_database_url():
+    """Builds the SQLAlchemy URL for the gold database."""
+    return URL.create(
+        "postgresql+psycopg2",
+        username=DB_USER,
+        password=DB_PASSWORD,
+        host=DB_HOST,
+        port=int(DB_PORT),
+        database=DB_NAME,
+    )
+
+
+def get_engine(profile='analysis'):
+    """
+    Returns the shared SQLAlchemy engine for a session profile ('analysis'
+    or 'load'). Engines are created on first use and no connection is opened
+    until a query runs; pre-ping replaces connections the server has dropped.
+    """
+    if profile not in SESSION_SETTINGS:
+        raise ValueError(f"Unknown database profile: {profile}")
+    if profile not in _engines:
+        options = ' '.join(
+            f"-c {name}={value}" for name, value in SESSION_SETTINGS[profile].items())
+        _engines[profile] = create_engine(
+            get_database_url(),
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=POOL_RECYCLE_SECONDS,
+            connect_args={'options': options},
+        )
+    return _engines[profile]
+
+
+def get_raw_connection(profile='load'):
+    """
+    Borrows a DBAPI (psycopg2) connection from the shared pool, for code that
+    works with cursors directly. close() returns it to the pool.
+    """
+    return get_engine(profile).raw_connection()
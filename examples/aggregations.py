@@ -0,0 +1,126 @@
+import json
+
+import pandas as pd
+
+# Number of sales entries turned into one DataFrame batch. Memory use is
+# bounded by this, not by the number or size of the input files.
+BATCH_SIZE = 200000
+READ_SIZE = 1 << 22  # 4 MB of text per read
+
+
+def iter_json_array(path, batch_size=BATCH_SIZE):
+    """
+    Streams the objects of a top-level JSON array (the grocery_sales_*.json
+    layout) in lists of roughly batch_size, without loading the whole file.
+    Objects must be flat (no nested objects), which holds for the sales files:
+    every '}' then ends a record, so each text block up to the last '}' is
+    decoded with a single json.loads call.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = f.read(READ_SIZE).lstrip()
+        if not buf.startswith('['):
+            raise ValueError(f"{path} does not contain a JSON array")
+        buf = buf[1:]
+        batch = []
+        while True:
+            more = f.read(READ_SIZE)
+            end = buf.rfind('}') + 1
+            if more and end == 0:
+                buf += more
+                continue
+            block = buf[:end].strip().lstrip(',')
+            buf = buf[end:] + more
+            if block:
+                batch.extend(json.loads('[' + block + ']'))
+            if len(batch) >= batch_size or (not more and batch):
+                yield batch
+                batch = []
+            if not more:
+                break
+        if buf.strip() != ']':
+            raise ValueError(f"{path} ends with unexpected content: {buf.strip()[:50]!r}")
+
+
+def iter_sales_batches(sales_files, batch_size=BATCH_SIZE):
+    """
+    Yields raw sales DataFrames (store_id, product_id, date, sales_amount).
+    Any number of yearly files can be given; they are read one after another.
+    """
+    for path in sales_files:
+        for batch in iter_json_array(path, batch_size):
+            yield pd.DataFrame.from_records(
+                batch, columns=['store_id', 'product_id', 'date', 'sales_amount'])
+
+
+def load_lookup(path, key, value):
+    """Loads a products.json/stores.json file as a key -> value Series."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return pd.Series({item[key]: item[value] for item in data}, name=value)
+
+
+def _combine(partials, keys, value_cols):
+    """Merges per-batch group-by results into the final aggregate."""
+    if not partials:
+        return pd.DataFrame(columns=keys + value_cols)
+    return (pd.concat(partials)
+            .groupby(keys, as_index=False)[value_cols].sum()
+            .sort_values(keys, ignore_index=True))
+
+
+def monthly_sales_by_municipality(sales_files, stores_path, batch_size=BATCH_SIZE):
+    """
+    Joins sales -> stores -> municipality and sums sales_amount per
+    (municipality_code, year, month).
+    """
+    municipality = load_lookup(stores_path, 'store_id', 'municipality_code')
+    # Group on the raw store/month strings first; the lookups then only touch
+    # one row per store and month instead of every sale.
+    partials = []
+    for df in iter_sales_batches(sales_files, batch_size):
+        daily = df.groupby(['store_id', 'date'], as_index=False)['sales_amount'].sum()
+        daily['month'] = daily['date'].str[:7]
+        partials.append(
+            daily.groupby(['store_id', 'month'], as_index=False)['sales_amount'].sum())
+    df = _combine(partials, ['store_id', 'month'], ['sales_amount'])
+
+    df['municipality_code'] = df['store_id'].map(municipality)
+    df['year'] = df['month'].str[:4].astype(int)
+    df['month'] = df['month'].str[5:7].astype(int)
+    keys = ['municipality_code', 'year', 'month']
+    return _combine([df], keys, ['sales_amount'])
+
+
+def sales_by_category(sales_files, products_path, batch_size=BATCH_SIZE):
+    """Joins sales -> products -> category and sums sales_amount per category."""
+    category = load_lookup(products_path, 'product_id', 'product_category')
+    partials = []
+    for df in iter_sales_batches(sales_files, batch_size):
+        partials.append(
+            df.groupby('product_id', as_index=False)['sales_amount'].sum())
+    df = _combine(partials, ['product_id'], ['sales_amount'])
+
+    df['category'] = df['product_id'].map(category)
+    result = _combine([df], ['category'], ['sales_amount'])
+    return result.sort_values('sales_amount', ascending=False, ignore_index=True)
+
+
+def monthly_tourism_by_municipality(tourism_path):
+    """Sums visitor_count and revenue per (municipality_code, year, month)."""
+    df = pd.read_csv(tourism_path, encoding='utf-8',
+                     usecols=['municipality_code', 'year', 'month',
+                              'visitor_count', 'revenue'])
+    keys = ['municipality_code', 'year', 'month']
+    return df.groupby(keys, as_index=False)[['visitor_count', 'revenue']].sum()
+
+
+def sales_vs_tourism(sales_files, stores_path, tourism_path, batch_size=BATCH_SIZE):
+    """
+    Monthly grocery sales next to monthly tourism per municipality. Only
+    months present in both sources are kept.
+    """
+    grocery = monthly_sales_by_municipality(sales_files, stores_path, batch_size)
+    tourism = monthly_tourism_by_municipality(tourism_path)
+    return (tourism.merge(grocery, on=['municipality_code', 'year', 'month'])
+            .sort_values(['municipality_code', 'year', 'month'], ignore_index=True))
+
@@ -1,25 +1,15 @@
-import json
-from collections import defaultdict
+import sys
 
-# Load stores
-with open('../bronze/grocery/stores.json', 'r') as f:
-    stores = {s['store_id']: s for s in json.load(f)}
+from aggregations import monthly_sales_by_municipality
 
-# Load sales for a year
-with open('../bronze/grocery/grocery_sales_2023.json', 'r') as f:
-    sales = json.load(f)
+# Sales files to aggregate; pass several years on the command line, e.g.
+# python ex2.py ../bronze/grocery/grocery_sales_2022.json ../bronze/grocery/grocery_sales_2023.json
+sales_files = sys.argv[1:] or ['../bronze/grocery/grocery_sales_2023.json']
 
-# Aggregate by municipality and month
-monthly_sales = defaultdict(float)
-
-for sale in sales:
-    store = stores[sale['store_id']]
-    municipality = store['municipality_code']
-    year, month = sale['date'][:7].split('-')
-    # Extract YYYY-MM
-    key = (municipality, year, month)
-    monthly_sales[key] += sale['sales_amount']
+# Aggregate by municipality and month (sales -> stores -> municipality)
+monthly_sales = monthly_sales_by_municipality(
+    sales_files, '../bronze/grocery/stores.json')
 
 # Print results
-for (municipality, year, month), total in sorted(monthly_sales.items()):
-    print(f"{municipality} {year}-{month}: {total:.2f} EUR")
\ No newline at end of file
+for row in monthly_sales.itertuples(index=False):
+    print(f"{row.municipality_code} {row.year}-{row.month:02d}: {row.sales_amount:.2f} EUR")
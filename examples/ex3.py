@@ -1,38 +1,19 @@
-import csv
-import json
-from collections import defaultdict
+import sys
 
-# Load tourism data
-tourism = {}
-with open('../bronze/tourism/tourism_data.csv', 'r') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        key = (row['municipality_code'], row['year'], row['month'])
-        tourism[key] = {
-            'visitor_count': int(row['visitor_count']),
-            'revenue': float(row['revenue'])
-        }
+from aggregations import sales_vs_tourism
 
-# Load stores
-with open('../bronze/grocery/stores.json', 'r') as f:
-    stores = {s['store_id']: s for s in json.load(f)}
+# Sales files to aggregate; pass several years on the command line
+sales_files = sys.argv[1:] or ['../bronze/grocery/grocery_sales_2023.json']
 
-# Load and aggregate grocery sales
-with open('../bronze/grocery/grocery_sales_2023.json', 'r') as f:
-    sales = json.load(f)
-
-monthly_grocery = defaultdict(float)
-for sale in sales:
-    store = stores[sale['store_id']]
-    municipality = store['municipality_code']
-    year, month = sale['date'][:7].split('-')
-    key = (municipality, year, month)
-    monthly_grocery[key] += sale['sales_amount']
+# Monthly grocery sales and tourism per municipality, joined on month
+combined = sales_vs_tourism(
+    sales_files,
+    '../bronze/grocery/stores.json',
+    '../bronze/tourism/tourism_data.csv')
 
 # Correlate
-for key in sorted(tourism.keys()):
-    if key in monthly_grocery:
-        print(f"{key[0]} {key[1]}-{key[2]}:")
-        print(f" Tourism: {tourism[key]['visitor_count']} visitors, {tourism[key]['revenue']:.2f} EUR revenue")
-        print(f" Grocery: {monthly_grocery[key]:.2f} EUR")
-        print()
\ No newline at end of file
+for row in combined.itertuples(index=False):
+    print(f"{row.municipality_code} {row.year}-{row.month:02d}:")
+    print(f" Tourism: {row.visitor_count} visitors, {row.revenue:.2f} EUR revenue")
+    print(f" Grocery: {row.sales_amount:.2f} EUR")
+    print()
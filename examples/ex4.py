@@ -1,21 +1,13 @@
-import json
-from collections import defaultdict
+import sys
 
-# Load products
-with open('../bronze/grocery/products.json', 'r') as f:
-    products = {p['product_id']: p for p in json.load(f)}
+from aggregations import sales_by_category
 
-# Load sales
-with open('../bronze/grocery/grocery_sales_2023.json', 'r') as f:
-    sales = json.load(f)
+# Sales files to aggregate; pass several years on the command line
+sales_files = sys.argv[1:] or ['../bronze/grocery/grocery_sales_2023.json']
 
-# Aggregate by category
-category_sales = defaultdict(float)
-for sale in sales:
-    product = products[sale['product_id']]
-    category = product['product_category']
-    category_sales[category] += sale['sales_amount']
+# Aggregate by category (sales -> products -> category)
+category_sales = sales_by_category(sales_files, '../bronze/grocery/products.json')
 
 # Print results
-for category, total in sorted(category_sales.items(), key=lambda x: x[1], reverse=True):
-    print(f"{category}: {total:.2f} EUR")
\ No newline at end of file
+for row in category_sales.itertuples(index=False):
+    print(f"{row.category}: {row.sales_amount:.2f} EUR")
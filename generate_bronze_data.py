@@ -0,0 +1,347 @@
+import argparse
+import csv
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import parallel_transform
+
+# Define paths
+bronze_path = 'bronze'
+
+# Åland municipalities (code, name). Names are single words so that the
+# "<muni> Kvinnor" / "<muni> Män" demographics headers split cleanly.
+MUNICIPALITIES = [
+    ('BR', 'Brändö'), ('EC', 'Eckerö'), ('FI', 'Finström'), ('FO', 'Föglö'),
+    ('GE', 'Geta'), ('HA', 'Hammarland'), ('JO', 'Jomala'), ('KU', 'Kumlinge'),
+    ('KO', 'Kökar'), ('LE', 'Lemland'), ('LU', 'Lumparland'), ('SA', 'Saltvik'),
+    ('SO', 'Sottunga'), ('SU', 'Sund'), ('VA', 'Vårdö'), ('MH', 'Mariehamn'),
+]
+
+# Relative size of each municipality, used for population, store placement
+# and tourism volume. Mariehamn dominates, the archipelago is small.
+MUNICIPALITY_WEIGHTS = np.array(
+    [0.5, 0.9, 2.3, 0.6, 0.5, 1.4, 3.3, 0.4, 0.3, 1.6, 0.4, 1.7, 0.15, 1.0, 0.4, 10.5])
+
+CATEGORIES = {
+    'produce': ['Organic Tomatoes', 'Fresh Lettuce', 'Potatoes', 'Carrots', 'Apples'],
+    'dairy': ['Whole Milk', 'Butter', 'Yoghurt', 'Cheese', 'Cream'],
+    'bakery': ['Rye Bread', 'Baguette', 'Cinnamon Buns', 'Crispbread'],
+    'meat': ['Minced Beef', 'Pork Chops', 'Chicken Fillet', 'Sausages'],
+    'seafood': ['Salmon Fillet', 'Pickled Herring', 'Shrimp', 'Perch'],
+    'beverages': ['Coffee', 'Orange Juice', 'Mineral Water', 'Apple Cider'],
+    'frozen': ['Frozen Pizza', 'Ice Cream', 'Frozen Berries'],
+    'pantry': ['Pasta', 'Rice', 'Oat Flakes', 'Canned Beans', 'Flour'],
+}
+UNIT_TYPES = ['kg', 'piece', 'liter', 'pack']
+SUPPLIERS = ['Nordic Foods', 'Åland Produce', 'Baltic Trading', 'Archipelago Farms']
+STREETS = ['Harbor Road', 'Main Street', 'Church Road', 'Village Lane', 'Sea View']
+
+ACCOMMODATION_TYPES = ['guesthouse', 'camping', 'hotel']
+ORIGIN_COUNTRIES = ['Finland', 'Sweden', 'Denmark', 'Germany', 'Norway',
+                    'Estonia', 'Netherlands', 'United Kingdom']
+
+# Monthly multipliers: Åland sees a strong summer peak in both tourism and
+# grocery sales.
+TOURISM_SEASON = np.array(
+    [0.3, 0.3, 0.4, 0.6, 0.9, 1.6, 2.4, 2.1, 1.0, 0.5, 0.3, 0.4])
+SALES_SEASON = np.array(
+    [0.9, 0.85, 0.9, 0.95, 1.0, 1.15, 1.3, 1.25, 1.0, 0.95, 0.9, 1.1])
+
+# Rows are formatted and written in blocks of roughly this size so memory
+# stays flat regardless of the total volume.
+SALES_BLOCK_ROWS = 500000
+
+
+def make_rng(seed, *stream):
+    """Returns a generator seeded from the base seed and a stream id, so every
+    file can be generated independently and reproducibly."""
+    return np.random.default_rng([seed, *stream])
+
+
+def generate_stores(seed, n_stores):
+    """Places stores in municipalities proportionally to municipality size."""
+    rng = make_rng(seed, 1)
+    probs = MUNICIPALITY_WEIGHTS / MUNICIPALITY_WEIGHTS.sum()
+    # Every municipality gets at least one store while there are enough stores
+    placement = list(range(min(n_stores, len(MUNICIPALITIES))))
+    placement += rng.choice(len(MUNICIPALITIES), size=n_stores - len(placement),
+                            p=probs).tolist()
+    placement.sort()
+
+    stores = []
+    per_muni = {}
+    for i, muni_idx in enumerate(placement, start=1):
+        code, name = MUNICIPALITIES[muni_idx]
+        per_muni[name] = per_muni.get(name, 0) + 1
+        stores.append({
+            'store_id': f'STORE_{i:03d}',
+            'municipality_code': code,
+            'municipality_name': name,
+            'store_location': f'{rng.choice(STREETS)} {rng.integers(1, 60)}',
+            'store_name': f'Åland Grocery {name} {per_muni[name]}',
+        })
+    return stores
+
+
+def generate_products(seed, n_products):
+    """Creates products cycling through the categories."""
+    rng = make_rng(seed, 2)
+    categories = list(CATEGORIES)
+    products = []
+    for i in range(1, n_products + 1):
+        category = categories[(i - 1) % len(categories)]
+        names = CATEGORIES[category]
+        base = names[((i - 1) // len(categories)) % len(names)]
+        variant = (i - 1) // (len(categories) * len(names))
+        products.append({
+            'product_id': f'PROD_{i:03d}',
+            'product_name': base if variant == 0 else f'{base} {variant + 1}',
+            'product_category': category,
+            'unit_price': round(float(rng.uniform(0.8, 25.0)), 2),
+            'unit_type': str(rng.choice(UNIT_TYPES)),
+            'supplier': str(rng.choice(SUPPLIERS)),
+        })
+    return products
+
+
+def write_json(data, file_path):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def generate_sales_year(args):
+    """
+    Streams one grocery_sales_<year>.json file.
+    - Every store gets rows_per_store_day sales rows for each day.
+    - Products are drawn at random; amounts follow unit price and season.
+    Rows are produced in day blocks, so memory use is bounded by
+    SALES_BLOCK_ROWS rather than by the size of the year.
+    """
+    seed, year, output_dir, n_stores, unit_prices, rows_per_store_day = args
+    rng = make_rng(seed, 3, year)
+    n_products = len(unit_prices)
+    unit_prices = np.asarray(unit_prices)
+
+    days = np.arange(f'{year}-01-01', f'{year + 1}-01-01', dtype='datetime64[D]')
+    day_strings = days.astype(str)
+    months = days.astype('datetime64[M]').astype(int) % 12
+    rows_per_day = n_stores * rows_per_store_day
+    days_per_block = max(1, SALES_BLOCK_ROWS // rows_per_day)
+
+    store_labels = np.array([f'STORE_{i:03d}' for i in range(1, n_stores + 1)])
+    product_labels = np.array([f'PROD_{i:03d}' for i in range(1, n_products + 1)])
+    day_store = np.repeat(np.arange(n_stores), rows_per_store_day)
+
+    file_path = os.path.join(output_dir, f'grocery_sales_{year}.json')
+    row_count = 0
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for start in range(0, len(days), days_per_block):
+            block_days = slice(start, start + days_per_block)
+            n_days = len(day_strings[block_days])
+            n = n_days * rows_per_day
+
+            day_idx = np.repeat(np.arange(start, start + n_days), rows_per_day)
+            store_idx = np.tile(day_store, n_days)
+            product_idx = rng.integers(0, n_products, size=n)
+            units = rng.poisson(
+                20 * SALES_SEASON[months[day_idx]]).astype(np.int64) + 1
+            amounts = np.round(
+                units * unit_prices[product_idx] * rng.uniform(0.85, 1.15, size=n), 2)
+
+            rows = ',\n'.join(
+                f'  {{"store_id": "{s}", "product_id": "{p}", "date": "{d}", '
+                f'"sales_amount": {a}, "units_sold": {u}}}'
+                for s, p, d, a, u in zip(
+                    store_labels[store_idx].tolist(),
+                    product_labels[product_idx].tolist(),
+                    day_strings[day_idx].tolist(),
+                    amounts.tolist(),
+                    units.tolist()))
+            if row_count:
+                f.write(',\n')
+            f.write(rows)
+            row_count += n
+        f.write('\n]\n')
+
+    print(f"generated {file_path} ({row_count} rows)")
+    return row_count
+
+
+def generate_tourism(seed, start_year, end_year, file_path):
+    """
+    Writes tourism_data.csv with one row per municipality, month,
+    accommodation type and origin country.
+    """
+    rng = make_rng(seed, 4)
+    fields = ['municipality_code', 'municipality_name', 'year', 'month', 'date',
+              'visitor_count', 'accommodation_type', 'origin_country', 'revenue']
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for year in range(start_year, end_year + 1):
+            for month in range(1, 13):
+                date = f'{year}-{month:02d}-01'
+                shape = (len(MUNICIPALITIES), len(ACCOMMODATION_TYPES),
+                         len(ORIGIN_COUNTRIES))
+                expected = (MUNICIPALITY_WEIGHTS[:, None, None]
+                            * TOURISM_SEASON[month - 1] * 40)
+                visitors = rng.poisson(np.broadcast_to(expected, shape))
+                revenue = np.round(visitors * rng.uniform(60, 140, size=shape), 2)
+                for m, (code, name) in enumerate(MUNICIPALITIES):
+                    for a, accommodation in enumerate(ACCOMMODATION_TYPES):
+                        for c, country in enumerate(ORIGIN_COUNTRIES):
+                            writer.writerow([
+                                code, name, year, month, date,
+                                int(visitors[m, a, c]), accommodation, country,
+                                float(revenue[m, a, c])])
+    print(f"generated {file_path}")
+
+
+def generate_demographics(seed, start_year, end_year, file_path):
+    """
+    Writes api_data_gender.csv in the wide PXWeb layout:
+    "år","ålder","<muni> Kvinnor","<muni> Män",...,"Åland Kvinnor","Åland Män"
+    with a "Totalt" row per year followed by one row per age.
+    """
+    rng = make_rng(seed, 5)
+    ages = [str(a) for a in range(0, 100)] + ['100+']
+    # Base population per municipality, gender and age; drifts a little each year
+    base = (MUNICIPALITY_WEIGHTS[:, None, None] * 13
+            * rng.uniform(0.6, 1.4, size=(len(MUNICIPALITIES), 2, len(ages))))
+    base[:, :, 85:] *= np.linspace(0.9, 0.05, len(ages) - 85)
+
+    header = ['år', 'ålder']
+    for _, name in MUNICIPALITIES:
+        header += [f'{name} Kvinnor', f'{name} Män']
+    header += ['Åland Kvinnor', 'Åland Män']
+
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerow(header)
+        for year in range(start_year, end_year + 1):
+            growth = 1 + 0.006 * (year - start_year)
+            counts = rng.poisson(base * growth)
+            # Rows are ages; columns are municipality/gender pairs
+            per_age = counts.transpose(2, 0, 1).reshape(len(ages), -1)
+            per_age = np.hstack([per_age, counts.sum(axis=0).T])
+            rows = [['Totalt', per_age.sum(axis=0)]] + list(zip(ages, per_age))
+            for age, values in rows:
+                writer.writerow([str(year), age] + [int(v) for v in values])
+    print(f"generated {file_path}")
+
+
+def generate_cost_of_living(seed, start_year, end_year, file_path):
+    """Writes costofliving.csv as a monthly index (2000=100)."""
+    rng = make_rng(seed, 6)
+    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    index_value = 100.0
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['year', 'month', '2000=100'])
+        for year in range(start_year, end_year + 1):
+            for month in month_names:
+                writer.writerow([year, month, round(index_value, 2)])
+                index_value *= 1 + rng.normal(0.0015, 0.002)
+    print(f"generated {file_path}")
+
+
+def existing_outputs(output_dir):
+    """Files in output_dir that generate() would overwrite or, for yearly
+    sales files outside the new year range, leave behind."""
+    paths = [os.path.join(output_dir, 'grocery', 'stores.json'),
+             os.path.join(output_dir, 'grocery', 'products.json'),
+             os.path.join(output_dir, 'tourism', 'tourism_data.csv'),
+             os.path.join(output_dir, 'demographics', 'api_data_gender.csv'),
+             os.path.join(output_dir, 'costofliving', 'costofliving.csv')]
+    existing = [path for path in paths if os.path.exists(path)]
+    return existing + sorted(glob.glob(os.path.join(output_dir, 'grocery', 'grocery_sales_*.json')))
+
+
+def generate(output_dir=bronze_path, seed=42, start_year=2000, end_year=2025,
+             n_stores=50, n_products=40, rows_per_store_day=10, max_workers=None,
+             force=False):
+    """
+    Generates a complete bronze layer. Returns the number of sales rows.
+    Raises FileExistsError if output_dir already holds bronze files (e.g.
+    data fetched from the APIs) unless force is set; with force, they are
+    replaced and all earlier grocery_sales_*.json files are removed, so no
+    stale years are picked up by process_to_silver.py.
+    """
+    existing = existing_outputs(output_dir)
+    if existing and not force:
+        raise FileExistsError(
+            f"{output_dir} already contains bronze data ({len(existing)} files, e.g. "
+            f"{existing[0]}); choose another --output or pass --force to replace it")
+    for stale in glob.glob(os.path.join(output_dir, 'grocery', 'grocery_sales_*.json')):
+        os.remove(stale)
+
+    grocery_dir = os.path.join(output_dir, 'grocery')
+    tourism_dir = os.path.join(output_dir, 'tourism')
+    demographics_dir = os.path.join(output_dir, 'demographics')
+    costofliving_dir = os.path.join(output_dir, 'costofliving')
+    for path in (grocery_dir, tourism_dir, demographics_dir, costofliving_dir):
+        os.makedirs(path, exist_ok=True)
+
+    stores = generate_stores(seed, n_stores)
+    products = generate_products(seed, n_products)
+    write_json(stores, os.path.join(grocery_dir, 'stores.json'))
+    write_json(products, os.path.join(grocery_dir, 'products.json'))
+    print(f"generated {len(stores)} stores and {len(products)} products")
+
+    generate_tourism(seed, start_year, end_year,
+                     os.path.join(tourism_dir, 'tourism_data.csv'))
+    generate_demographics(seed, start_year, end_year,
+                          os.path.join(demographics_dir, 'api_data_gender.csv'))
+    generate_cost_of_living(seed, start_year, end_year,
+                            os.path.join(costofliving_dir, 'costofliving.csv'))
+
+    unit_prices = [p['unit_price'] for p in products]
+    jobs = [(seed, year, grocery_dir, n_stores, unit_prices, rows_per_store_day)
+            for year in range(start_year, end_year + 1)]
+
+    if max_workers is None:
+        max_workers = parallel_transform.default_workers()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        total_rows = sum(executor.map(generate_sales_year, jobs))
+
+    print(f"\nBronze data generation complete: {total_rows} sales rows.")
+    return total_rows
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Generate deterministic synthetic bronze data. "
+                    "Sales rows = stores x rows-per-store-day x days.")
+    parser.add_argument('--output', default=bronze_path,
+                        help="Bronze directory to write into (default: bronze)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--start-year', type=int, default=2000)
+    parser.add_argument('--end-year', type=int, default=2025)
+    parser.add_argument('--stores', type=int, default=50)
+    parser.add_argument('--products', type=int, default=40)
+    parser.add_argument('--rows-per-store-day', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true',
+                        help="Replace bronze files already in the output directory "
+                             "(including fetched API data) and remove old sales years")
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_parser()
+    args = parser.parse_args()
+    try:
+        generate(output_dir=args.output, seed=args.seed,
+                 start_year=args.start_year, end_year=args.end_year,
+                 n_stores=args.stores, n_products=args.products,
+                 rows_per_store_day=args.rows_per_store_day,
+                 max_workers=args.workers, force=args.force)
+    except FileExistsError as e:
+        parser.error(str(e))
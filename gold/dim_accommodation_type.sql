@@ -0,0 +1,8 @@
+-- Dimension: Accommodation Type
+-- The kinds of accommodation tourists stay in (hotel, camping, guesthouse).
+-- fact_tourism references it with a SMALLINT key instead of repeating the text.
+
+CREATE TABLE IF NOT EXISTS dim_accommodation_type (
+    accommodation_type_key  SMALLSERIAL PRIMARY KEY,
+    name                    VARCHAR(50) UNIQUE NOT NULL
+);
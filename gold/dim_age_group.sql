@@ -0,0 +1,8 @@
+-- Dimension: Age Group
+-- One-year age groups from the population statistics ('0', '1', ..., '100+'),
+-- referenced by fact_demographics.
+
+CREATE TABLE IF NOT EXISTS dim_age_group (
+    age_group_key       SMALLSERIAL PRIMARY KEY,
+    name                VARCHAR(20) UNIQUE NOT NULL
+);
@@ -0,0 +1,7 @@
+-- Dimension: Gender
+-- Genders as labelled in the source data (Kvinnor, Män).
+
+CREATE TABLE IF NOT EXISTS dim_gender (
+    gender_key          SMALLSERIAL PRIMARY KEY,
+    name                VARCHAR(20) UNIQUE NOT NULL
+);
@@ -0,0 +1,7 @@
+-- Dimension: Origin Country
+-- The countries tourists travel from, referenced by fact_tourism.
+
+CREATE TABLE IF NOT EXISTS dim_origin_country (
+    origin_country_key  SMALLSERIAL PRIMARY KEY,
+    name                VARCHAR(100) UNIQUE NOT NULL
+);
@@ -5,7 +5,7 @@ CREATE TABLE IF NOT EXISTS fact_demographics (
     demographics_key    BIGSERIAL PRIMARY KEY,
     date_key            INTEGER REFERENCES dim_date(date_key),
     municipality_key    INTEGER REFERENCES dim_municipality(municipality_key),
-    age_group           VARCHAR(20),
-    gender              VARCHAR(20),
+    age_group_key       SMALLINT REFERENCES dim_age_group(age_group_key),
+    gender_key          SMALLINT REFERENCES dim_gender(gender_key),
     population_count    INTEGER NOT NULL
 );
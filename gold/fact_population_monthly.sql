@@ -0,0 +1,12 @@
+-- Fact: Population per municipality and month
+-- Linear interpolation between the yearly (January 1) population counts, so
+-- monthly figures such as sales per capita have a matching population. Months
+-- after the last count carry that count forward.
+
+CREATE TABLE IF NOT EXISTS fact_population_monthly (
+    municipality_key    INTEGER REFERENCES dim_municipality(municipality_key),
+    year                SMALLINT NOT NULL,
+    month_of_year       SMALLINT NOT NULL,
+    population          DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (municipality_key, year, month_of_year)
+);
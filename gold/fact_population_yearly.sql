@@ -0,0 +1,10 @@
+-- Fact: Population per municipality and year
+-- Snapshot of fact_demographics summed over age groups and genders, built at
+-- load time so per-capita queries do not re-aggregate the demographics.
+
+CREATE TABLE IF NOT EXISTS fact_population_yearly (
+    municipality_key    INTEGER REFERENCES dim_municipality(municipality_key),
+    year                SMALLINT NOT NULL,
+    population          INTEGER NOT NULL,
+    PRIMARY KEY (municipality_key, year)
+);
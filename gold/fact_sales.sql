@@ -1,5 +1,7 @@
 -- Fact: Sales
--- This table records individual sales events.
+-- One row per product, store and day; rows are merged on this natural key.
+-- Sales lines sharing a key are summed, so averages over rows are per
+-- product, store and day rather than per sales line.
 
 CREATE TABLE IF NOT EXISTS fact_sales (
     sales_key       BIGSERIAL PRIMARY KEY,
@@ -7,5 +9,6 @@ CREATE TABLE IF NOT EXISTS fact_sales (
     store_key       INTEGER REFERENCES dim_store(store_key),
     product_key     INTEGER REFERENCES dim_product(product_key),
     sales_amount    NUMERIC(10, 2) NOT NULL,
-    units_sold      INTEGER NOT NULL
+    units_sold      INTEGER NOT NULL,
+    CONSTRAINT uq_fact_sales_natural_key UNIQUE (date_key, store_key, product_key)
 );
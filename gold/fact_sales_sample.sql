@@ -0,0 +1,16 @@
+-- Fact: Sales sample
+-- Stratified sample of fact_sales (per month and store) for approximate
+-- analysis. weight = rows in the stratum / sampled rows, so weighted sums
+-- estimate fact_sales totals. replicate splits the sample into random groups
+-- used to compute confidence intervals.
+
+CREATE TABLE IF NOT EXISTS fact_sales_sample (
+    sales_key       BIGINT PRIMARY KEY,
+    date_key        INTEGER REFERENCES dim_date(date_key),
+    store_key       INTEGER REFERENCES dim_store(store_key),
+    product_key     INTEGER REFERENCES dim_product(product_key),
+    sales_amount    NUMERIC(10, 2) NOT NULL,
+    units_sold      INTEGER NOT NULL,
+    weight          DOUBLE PRECISION NOT NULL,
+    replicate       SMALLINT NOT NULL
+);
@@ -1,14 +1,18 @@
 -- Indexes for Foreign Keys (crucial for JOIN performance)
 -- Postgres does not automatically index FKs, so we must do it manually.
-CREATE INDEX IF NOT EXISTS idx_fact_sales_date ON fact_sales(date_key);
+-- fact_sales(date_key) is covered by the uq_fact_sales_natural_key unique index
 CREATE INDEX IF NOT EXISTS idx_fact_sales_store ON fact_sales(store_key);
 CREATE INDEX IF NOT EXISTS idx_fact_sales_product ON fact_sales(product_key);
 
 CREATE INDEX IF NOT EXISTS idx_fact_tourism_date ON fact_tourism(date_key);
 CREATE INDEX IF NOT EXISTS idx_fact_tourism_municipality ON fact_tourism(municipality_key);
+CREATE INDEX IF NOT EXISTS idx_fact_tourism_accommodation_type ON fact_tourism(accommodation_type_key);
+CREATE INDEX IF NOT EXISTS idx_fact_tourism_origin_country ON fact_tourism(origin_country_key);
 
 CREATE INDEX IF NOT EXISTS idx_fact_demographics_date ON fact_demographics(date_key);
 CREATE INDEX IF NOT EXISTS idx_fact_demographics_municipality ON fact_demographics(municipality_key);
+CREATE INDEX IF NOT EXISTS idx_fact_demographics_age_group ON fact_demographics(age_group_key);
+CREATE INDEX IF NOT EXISTS idx_fact_demographics_gender ON fact_demographics(gender_key);
 
 CREATE INDEX IF NOT EXISTS idx_fact_costofliving_date ON fact_costofliving(date_key);
 
@@ -0,0 +1,112 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import silver_io
+import validation
+
+# --- CONFIGURATION ---
+
+# Inputs are split into row ranges of roughly this size; each range is parsed,
+# transformed and written as one part file by a worker process.
+PART_MB = float(os.environ.get("SILVER_PART_MB", "64"))
+
+
+def default_workers():
+    """Worker process count shared by the pipeline's process pools: slightly
+    fewer workers than cores, at most 8."""
+    cpu_count = os.cpu_count() or 2  # Default to 2 if None
+    return min(8, max(1, cpu_count - 1))
+
+
+def split_row_ranges(path, part_bytes):
+    """
+    Splits a CSV file into (start, end) byte ranges of about part_bytes that
+    start and end on row boundaries, so each range holds whole rows.
+    Returns (header line, ranges). Assumes quoted fields contain no newlines,
+    which holds for all bronze CSVs.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + part_bytes, size))
+            # Finish the row the seek landed in
+            f.readline()
+            ranges.append((start, f.tell()))
+            start = f.tell()
+    return header, ranges
+
+
+def _transform_part(task):
+    """
+    Parses one row range, applies the dataset transform and writes the result
+    as a part file (runs in a worker process).
+    Returns (rejected rows, rule failure counts, input rows, output rows).
+    """
+    path, header, start, end, part_path, codec, transform, read_csv_kwargs = task
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    raw = pd.read_csv(io.BytesIO(header + data), **read_csv_kwargs)
+
+    result = transform(raw)
+    if isinstance(result, pd.DataFrame):
+        df, rejected, counts = result, None, {}
+    else:
+        df, rejected, counts = result
+
+    df.to_csv(part_path, index=False, encoding='utf-8',
+              compression=silver_io.CODECS[codec][1])
+    return rejected, counts, len(raw), len(df)
+
+
+def run_partitioned(input_path, output_dir, dataset, transform, rules=None,
+                    part_mb=PART_MB, max_workers=None, codec=silver_io.SILVER_CODEC,
+                    **read_csv_kwargs):
+    """
+    Runs a vectorized transform over a large CSV in parallel and writes the
+    result to output_dir/<dataset>/part-NNNNN.csv[.gz|.zst], one part per row
+    range, compressed with codec by the worker that produced it.
+
+    transform(raw_df) returns the transformed DataFrame, or
+    (valid_df, rejected_df, counts) when it applies validation rules; the
+    rules are then passed here too so the quarantine report can be written.
+    Transforms must be module-level functions so they can be sent to the
+    worker processes. Returns the list of part files.
+    """
+    header, ranges = split_row_ranges(input_path, int(part_mb * 1024 * 1024))
+    if not ranges:
+        # Header only: still write one (empty) part so readers see the columns
+        ranges = [(len(header), len(header))]
+
+    part_dir = os.path.join(output_dir, dataset)
+    silver_io.prepare_part_dir(part_dir)
+
+    part_paths = [silver_io.part_path(part_dir, i, codec) for i in range(len(ranges))]
+    tasks = [(input_path, header, start, end, part_path, codec, transform, read_csv_kwargs)
+             for (start, end), part_path in zip(ranges, part_paths)]
+
+    if max_workers is None:
+        max_workers = default_workers()
+    if max_workers == 1 or len(tasks) == 1:
+        # Not worth starting processes for a single range
+        results = [_transform_part(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+            results = list(executor.map(_transform_part, tasks))
+
+    if rules is not None:
+        rejected = pd.concat([r[0] for r in results], ignore_index=True)
+        counts = validation.merge_counts(r[1] for r in results)
+        validation.write_quarantine(
+            output_dir, dataset, rejected, counts, sum(r[2] for r in results), rules)
+
+    print(f"  {dataset}: {sum(r[3] for r in results)} rows in {len(part_paths)} "
+          f"part(s) using {min(max_workers, len(tasks))} worker(s)")
+    return part_paths
+
@@ -0,0 +1,101 @@
+"""
+Single entry point for the pipeline stages:
+
+    python pipeline.py fetch [--source demographics|costofliving|all]
+    python pipeline.py silver [--codec none|gzip|zstd]
+    python pipeline.py gold [--skip-create] [--create-only] [--cache]
+                             [--merge-sales [--years YEAR ...]]
+    python pipeline.py analyze [--pushdown] [--verify-pushdown]
+                               [--sample [table|tablesample]] [--sample-percent PCT]
+
+Only the standard library and cli_options (the option definitions shared
+with the stage scripts) are imported here. Each stage imports its own
+modules (and with them pandas, scipy, SQLAlchemy, ...) when it runs, so
+`--help` and argument errors return immediately.
+"""
+import argparse
+import sys
+
+import cli_options
+
+
+def run_fetch(args):
+    if args.source in ('demographics', 'all'):
+        import get_demographics_csv
+        get_demographics_csv.fetch_data()
+    if args.source in ('costofliving', 'all'):
+        import get_costofliving_csv
+        get_costofliving_csv.fetch_data()
+    return 0
+
+
+def run_silver(args):
+    import process_to_silver
+    process_to_silver.main(codec=args.codec)
+    return 0
+
+
+def run_gold(args):
+    if not args.skip_create:
+        import create_gold_tables
+        create_gold_tables.main()
+    if args.create_only:
+        return 0
+    import silver_to_gold
+    if args.merge_sales:
+        silver_to_gold.merge_sales(use_cache=args.cache, years=args.years)
+    else:
+        silver_to_gold.main(use_cache=args.cache)
+    return 0
+
+
+def run_analyze(args):
+    import analyze_data
+    if args.verify_pushdown:
+        return 0 if analyze_data.verify_pushdown() else 1
+    analyze_data.TABLESAMPLE_PERCENT = args.sample_percent
+    analyze_data.main(pushdown=args.pushdown, sample=args.sample)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="BI data integration pipeline: bronze -> silver -> gold -> analysis.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch = subparsers.add_parser('fetch', help="Download bronze data from the APIs")
+    fetch.add_argument('--source', choices=['demographics', 'costofliving', 'all'],
+                       default='all')
+    fetch.set_defaults(func=run_fetch)
+
+    silver = subparsers.add_parser('silver', help="Transform bronze data to silver CSVs")
+    cli_options.add_silver_arguments(silver)
+    silver.set_defaults(func=run_silver)
+
+    gold = subparsers.add_parser('gold', help="Create the star schema and load silver data")
+    gold.add_argument('--skip-create', action='store_true',
+                      help="Do not run the CREATE TABLE scripts")
+    gold.add_argument('--create-only', action='store_true',
+                      help="Only create the tables, do not load data")
+    gold.add_argument('--cache', action='store_true',
+                      help="Read silver sales through the memory-mapped silver cache")
+    gold.add_argument('--merge-sales', action='store_true',
+                      help="Only upsert fact_sales into the existing gold tables")
+    gold.add_argument('--years', type=int, nargs='+',
+                      help="With --merge-sales, only merge sales of these years")
+    gold.set_defaults(func=run_gold)
+
+    analyze = subparsers.add_parser('analyze', help="Run the analysis queries")
+    cli_options.add_analyze_arguments(analyze)
+    analyze.set_defaults(func=run_analyze)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
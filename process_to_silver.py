@@ -1,26 +1,59 @@
 
+import argparse
+import numpy as np
 import pandas as pd
 import json
 import os
 import glob
 from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import cli_options
+import parallel_transform
+import silver_io
+import validation
 
 # Define paths
 bronze_path = 'bronze'
 silver_path = 'silver'
 
-
-def process_demographics():
+VALID_ACCOMMODATION_TYPES = ["guesthouse", "camping", "hotel"]
+
+# Data quality rules. Failing 'reject' rows go to silver/quarantine instead of
+# the silver file; 'warn' rules are only reported.
+TOURISM_RULES = [
+    validation.not_null('municipality_name', 'date', 'year', 'month', 'visitor_count'),
+    # Missing dates, years and months are left to not_null, so each defect
+    # is counted under one rule
+    validation.expression('year matches date',
+                          lambda df: (df['date'].dt.year == df['year'])
+                          | df['date'].isna() | df['year'].isna()),
+    validation.expression('month matches date',
+                          lambda df: (df['date'].dt.month == df['month'])
+                          | df['date'].isna() | df['month'].isna()),
+    validation.in_range('visitor_count', min_value=0),
+    # For this exercise, we allow unknown types but in a real scenario, this would need a decision.
+    validation.allowed_values('accommodation_type', VALID_ACCOMMODATION_TYPES, action='warn'),
+]
+
+SALES_RULES = [
+    validation.not_null('store_id', 'product_id', 'date', 'sales_amount', 'units_sold'),
+    validation.in_range('sales_amount', min_value=0),
+    validation.in_range('units_sold', min_value=0),
+    # units_sold is stored as an integer; fractional counts are not rounded away
+    validation.expression('units_sold is integer',
+                          lambda df: (df['units_sold'] % 1 == 0) | df['units_sold'].isna()),
+    validation.references('store_id', 'store_ids'),
+    validation.references('product_id', 'product_ids'),
+]
+
+
+def transform_demographics(df):
     """
-    Processes demographics data:
+    Transforms a block of demographics rows:
     - Converts 'år' to integer.
     - Calculates total population for each municipality.
     """
-    print("Processing demographics data...")
-    file_path = os.path.join(
-        bronze_path, 'demographics', 'api_data_gender.csv')
-    df = pd.read_csv(file_path, dtype={'år': str}, encoding='utf-8')
-
     # Clean the 'år' column by removing quotes and converting to integer
     df['år'] = df['år'].str.replace('"', '').astype(int)
 
@@ -43,176 +76,184 @@ def process_demographics():
         total_col = f"{muni} Total"
         if kvinnor_col in df.columns and man_col in df.columns:
             df[total_col] = df[kvinnor_col] + df[man_col]
+    return df
 
-    # Save to silver
-    output_path = os.path.join(silver_path, 'demographics.csv')
-    df.to_csv(output_path, index=False, encoding='utf-8')
-    print(f"Demographics data saved to {output_path}")
 
+def process_demographics(max_workers=None, codec=silver_io.SILVER_CODEC):
+    """Processes demographics data in parallel row ranges (see transform_demographics)."""
+    print("Processing demographics data...")
+    file_path = os.path.join(
+        bronze_path, 'demographics', 'api_data_gender.csv')
+    parallel_transform.run_partitioned(
+        file_path, silver_path, 'demographics', transform_demographics,
+        max_workers=max_workers, codec=codec, dtype={'år': str, 'ålder': str},
+        encoding='utf-8')
+    print(f"Demographics data saved to {os.path.join(silver_path, 'demographics')}")
 
-def process_tourism():
+
+def transform_tourism(raw):
     """
-    Processes tourism data:
+    Transforms a block of tourism rows:
     - Verifies date-related columns.
     - Verifies 'accommodation_type'.
+    Returns (valid rows, rows failing TOURISM_RULES, rule failure counts).
+    """
+    # Verify date columns; unparseable values become NaN/NaT and fail not_null
+    df = raw.copy()
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['year'] = pd.to_numeric(df['year'], errors='coerce')
+    df['month'] = pd.to_numeric(df['month'], errors='coerce')
+    df['visitor_count'] = pd.to_numeric(df['visitor_count'], errors='coerce')
+
+    return validation.apply_rules(df, TOURISM_RULES, raw=raw)
+
+
+def process_tourism(max_workers=None, codec=silver_io.SILVER_CODEC):
+    """
+    Processes tourism data in parallel row ranges (see transform_tourism).
+    Rows failing TOURISM_RULES are quarantined.
     """
     print("Processing tourism data...")
     file_path = os.path.join(bronze_path, 'tourism', 'tourism_data.csv')
-    df = pd.read_csv(file_path, encoding='utf-8')
-
-    # Verify date columns
-    df['date'] = pd.to_datetime(df['date'])
-    df['year'] = pd.to_numeric(df['year'])
-    df['month'] = pd.to_numeric(df['month'])
-
-    # Verify that the year from 'date' matches the 'year' column
-    assert (df['date'].dt.year == df['year']).all()
-    # Verify that the month from 'date' matches the 'month' column
-    assert (df['date'].dt.month == df['month']).all()
-
-    # Verify 'accommodation_type'
-    valid_accommodation_types = ["guesthouse", "camping", "hotel"]
-    # Find any types not in the valid list
-    invalid_types = df[~df['accommodation_type'].isin(
-        valid_accommodation_types)]
-    if not invalid_types.empty:
-        print(
-            f"Warning: Found unexpected accommodation types: {invalid_types['accommodation_type'].unique()}")
-        # For this exercise, we'll allow them but in a real scenario, this would need a decision.
-
-    # Save to silver
-    output_path = os.path.join(silver_path, 'tourism.csv')
-    df.to_csv(output_path, index=False, encoding='utf-8')
-    print(f"Tourism data saved to {output_path}")
-
-
-def process_cost_of_living():
+    parallel_transform.run_partitioned(
+        file_path, silver_path, 'tourism', transform_tourism, rules=TOURISM_RULES,
+        max_workers=max_workers, codec=codec, encoding='utf-8')
+    print(f"Tourism data saved to {os.path.join(silver_path, 'tourism')}")
+
+
+# Month mapping for English abbreviations
+MONTH_MAP = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+
+def transform_cost_of_living(df):
     """
-    Processes cost of living data:
+    Transforms a block of cost of living rows:
     - Maps month names to numbers.
     - Creates a date column.
     """
+    # Update month to be numeric to match tourism.csv
+    df['month'] = df['month'].map(MONTH_MAP).astype(int)
+    df['year'] = pd.to_numeric(df['year']).astype(int)
+
+    # Create date column YYYY-MM-DD; each distinct month is formatted once
+    codes, months = pd.factorize(df['year'] * 100 + df['month'])
+    labels = np.array([f"{m // 100}-{m % 100:02d}-01" for m in months], dtype=object)
+    df['date'] = labels[codes]
+
+    # Reorder columns to match standard (year, month, date first)
+    cols = ['year', 'month', 'date'] + [c for c in df.columns if c not in ['year', 'month', 'date']]
+    return df[cols]
+
+
+def process_cost_of_living(max_workers=None, codec=silver_io.SILVER_CODEC):
+    """Processes cost of living data in parallel row ranges (see transform_cost_of_living)."""
     print("Processing cost of living data...")
     file_path = os.path.join(bronze_path, 'costofliving', 'costofliving.csv')
-    df = pd.read_csv(file_path, encoding='utf-8')
-
-    # Month mapping for English abbreviations
-    month_map = {
-        'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-        'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-    }
+    parallel_transform.run_partitioned(
+        file_path, silver_path, 'costofliving', transform_cost_of_living,
+        max_workers=max_workers, codec=codec, encoding='utf-8')
+    print(f"Cost of living data saved to {os.path.join(silver_path, 'costofliving')}")
 
-    df['month_num'] = df['month'].map(month_map)
-    df['year_int'] = pd.to_numeric(df['year'])
 
-    # Create date column YYYY-MM-DD
-    df['date'] = df.apply(lambda x: f"{int(x['year_int'])}-{int(x['month_num']):02d}-01", axis=1)
-    
-    # Update month to be numeric to match tourism.csv
-    df['month'] = df['month_num']
-    df['year'] = df['year_int']
+def load_reference_ids():
+    """Numeric store and product ids from the bronze stores/products files,
+    used by the referential checks in SALES_RULES."""
+    ids = {}
+    for column, file_name, prefix in [('store_id', 'stores.json', 'STORE_'),
+                                      ('product_id', 'products.json', 'PROD_')]:
+        with open(os.path.join(bronze_path, 'grocery', file_name), 'r', encoding='utf-8') as f:
+            ids[column + 's'] = {
+                int(item[column].replace(prefix, '')) for item in json.load(f)}
+    return ids
 
-    # Reorder columns to match standard (year, month, date first)
-    cols = ['year', 'month', 'date'] + [c for c in df.columns if c not in ['year', 'month', 'date', 'month_num', 'year_int']]
-    df = df[cols]
 
-    output_path = os.path.join(silver_path, 'costofliving.csv')
-    df.to_csv(output_path, index=False, encoding='utf-8')
-    print(f"Cost of living data saved to {output_path}")
+def parse_prefixed_ids(values, prefix):
+    """
+    Converts labels like 'STORE_001' to numbers (1). Each distinct label is
+    parsed once; labels that are not valid ids become NaN.
+    """
+    codes, labels = pd.factorize(values)
+    ids = pd.to_numeric(
+        pd.Series(labels, dtype=object).str.replace(prefix, '', regex=False),
+        errors='coerce').to_numpy(dtype=float)
+    return pd.Series(np.where(codes >= 0, ids[codes], np.nan), index=values.index)
 
 
-def process_grocery_sales():
+def process_single_file(file, context=None):
     """
-    Processes grocery sales data from multiple JSON files:
-    - Converts 'store_id' and 'product_id' to numeric.
-    - Extracts 'day', 'month', 'year' from 'date'.
-    - Combines all yearly data into one CSV.
+    Parses and validates one yearly sales file (runs in a worker process).
+    Returns (valid rows, rejected rows, rule failure counts, total rows).
     """
-    print("Processing grocery sales data...")
-    json_files = glob.glob(os.path.join(
-        bronze_path, 'grocery', 'grocery_sales_*.json'))
-    all_sales_data = []
-
-    for file in json_files:
-        with open(file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            for entry in data:
-                # Transform IDs
-                entry['store_id'] = int(
-                    entry['store_id'].replace('STORE_', ''))
-                entry['product_id'] = int(
-                    entry['product_id'].replace('PROD_', ''))
-
-                # Handle date
-                sale_date = pd.to_datetime(entry['date'])
-                entry['day'] = sale_date.day
-                entry['month'] = sale_date.month
-                entry['year'] = sale_date.year
-
-                all_sales_data.append(entry)
-            print(f"processed {file}")
-
-    df = pd.DataFrame(all_sales_data)
-
-    # Reorder columns to have date info together
-    if not df.empty:
-        cols = ['store_id', 'product_id', 'date', 'year',
-                'month', 'day', 'sales_amount', 'units_sold']
-        # Ensure all columns exist before reordering
-        df = df[[c for c in cols if c in df.columns]]
-
-    output_path = os.path.join(silver_path, 'grocery_sales.csv')
-    df.to_csv(output_path, index=False, encoding='utf-8')
-    print(f"Grocery sales data saved to {output_path}")
-
-
-def process_single_file(file):
-    df = pd.read_json(file, encoding='utf-8')
-
-    df['store_id'] = (
-        df['store_id']
-        .str.replace('STORE_', '', regex=False)
-        .astype('int32')
-    )
-    df['product_id'] = (
-        df['product_id']
-        .str.replace('PROD_', '', regex=False)
-        .astype('int32')
-    )
+    if context is None:
+        context = load_reference_ids()
+    raw = pd.read_json(file, encoding='utf-8', convert_dates=False)
 
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df = pd.DataFrame({
+        'store_id': parse_prefixed_ids(raw['store_id'], 'STORE_'),
+        'product_id': parse_prefixed_ids(raw['product_id'], 'PROD_'),
+        'date': pd.to_datetime(raw['date'], format='%Y-%m-%d', errors='coerce'),
+        'sales_amount': pd.to_numeric(raw['sales_amount'], errors='coerce'),
+        'units_sold': pd.to_numeric(raw['units_sold'], errors='coerce'),
+    })
+
+    df, rejected, counts = validation.apply_rules(df, SALES_RULES, context, raw=raw)
+
+    df = df.astype({'store_id': 'int32', 'product_id': 'int32', 'units_sold': 'int32'})
     df['year'] = df['date'].dt.year.astype('int16')
     df['month'] = df['date'].dt.month.astype('int8')
     df['day'] = df['date'].dt.day.astype('int8')
 
     print(f"processed {file}")
-    return df
+    return df, rejected, counts, len(raw)
 
 
-def process_grocery_sales_parallel():
-    print("Processing grocery sales data...")
+def write_sales_part(file, part_path, codec, context=None):
+    """
+    Processes one yearly sales file and writes it as a compressed silver part
+    (runs in a worker process, so files are compressed in parallel).
+    Returns (rejected rows, rule failure counts, total rows).
+    """
+    df, rejected, counts, total = process_single_file(file, context)
+    cols = ['store_id', 'product_id', 'date', 'year', 'month', 'day',
+            'sales_amount', 'units_sold']
+    df = df[[c for c in cols if c in df.columns]]
+    df.to_csv(part_path, index=False, encoding='utf-8',
+              compression=silver_io.CODECS[codec][1])
+    return rejected, counts, total
 
-    json_files = glob.glob(os.path.join(
-        bronze_path, 'grocery', 'grocery_sales_*.json'))
 
-    # Use slightly fewer workers than cores (best practice)
-    cpu_count = os.cpu_count() or 2  # Default to 2 if None
-    max_workers = min(8, max(1, cpu_count - 1))
+def process_grocery_sales_parallel(codec=silver_io.SILVER_CODEC):
+    """
+    Processes the yearly sales files in worker processes; each worker writes
+    its year as one part of silver/grocery_sales/.
+    """
+    print("Processing grocery sales data...")
 
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        dfs = list(executor.map(process_single_file, json_files))
+    json_files = sorted(glob.glob(os.path.join(
+        bronze_path, 'grocery', 'grocery_sales_*.json')))
 
-    df = pd.concat(dfs, ignore_index=True)
+    max_workers = parallel_transform.default_workers()
 
-    cols = ['store_id', 'product_id', 'date', 'year', 'month', 'day',
-            'sales_amount', 'units_sold']
-    df = df[[c for c in cols if c in df.columns]]
+    part_dir = os.path.join(silver_path, 'grocery_sales')
+    silver_io.prepare_part_dir(part_dir)
+    part_paths = [silver_io.part_path(part_dir, i, codec) for i in range(len(json_files))]
+
+    worker = partial(write_sales_part, codec=codec, context=load_reference_ids())
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(worker, json_files, part_paths))
 
-    output_path = os.path.join(silver_path, 'grocery_sales.csv')
-    df.to_csv(output_path, index=False, encoding='utf-8')
+    rejected = pd.concat([r[0] for r in results], ignore_index=True)
+    counts = validation.merge_counts(r[1] for r in results)
+    validation.write_quarantine(
+        silver_path, 'grocery_sales', rejected, counts,
+        sum(r[2] for r in results), SALES_RULES)
+    print(f"Grocery sales data saved to {part_dir}")
 
 
-def process_products():
+def process_products(codec=silver_io.SILVER_CODEC):
     """
     Processes product data:
     - Converts 'product_id' to numeric.
@@ -226,12 +267,11 @@ def process_products():
         item['product_id'] = int(item['product_id'].replace('PROD_', ''))
 
     df = pd.DataFrame(data)
-    output_path = os.path.join(silver_path, 'products.csv')
-    df.to_csv(output_path, index=False, encoding='utf-8')
+    output_path = silver_io.write_csv(df, os.path.join(silver_path, 'products'), codec)
     print(f"Products data saved to {output_path}")
 
 
-def process_stores():
+def process_stores(codec=silver_io.SILVER_CODEC):
     """
     Processes store data:
     - Converts 'store_id' to numeric.
@@ -245,22 +285,32 @@ def process_stores():
         item['store_id'] = int(item['store_id'].replace('STORE_', ''))
 
     df = pd.DataFrame(data)
-    output_path = os.path.join(silver_path, 'stores.csv')
-    df.to_csv(output_path, index=False, encoding='utf-8')
+    output_path = silver_io.write_csv(df, os.path.join(silver_path, 'stores'), codec)
     print(f"Stores data saved to {output_path}")
 
 
-if __name__ == '__main__':
+def main(codec=None):
+    """
+    Runs all bronze to silver transformations. codec ('none', 'gzip' or
+    'zstd') defaults to silver_io.SILVER_CODEC.
+    """
+    codec = codec or silver_io.SILVER_CODEC
+    silver_io.check_codec(codec)
     # Create silver directory if it doesn't exist
     if not os.path.exists(silver_path):
         os.makedirs(silver_path)
 
-    process_demographics()
-    process_tourism()
-    process_cost_of_living()
-    # process_grocery_sales()
-    process_grocery_sales_parallel()
-    process_products()
-    process_stores()
+    process_demographics(codec=codec)
+    process_tourism(codec=codec)
+    process_cost_of_living(codec=codec)
+    process_grocery_sales_parallel(codec)
+    process_products(codec)
+    process_stores(codec)
 
     print("\nSilver data processing complete.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Transform the bronze layer into silver CSVs.")
+    cli_options.add_silver_arguments(parser)
+    main(codec=parser.parse_args().codec)
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# --- CONFIGURATION ---
+
+# Where cached columns are stored and how large the cache may grow before the
+# least recently used entries are evicted.
+CACHE_DIR = os.environ.get("SILVER_CACHE_DIR", ".silver_cache")
+CACHE_MAX_MB = float(os.environ.get("SILVER_CACHE_MAX_MB", "4096"))
+
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+META_FILE = 'meta.json'
+HASH_MEMO_FILE = 'hashes.json'
+
+
+def file_hash(path, cache_dir=CACHE_DIR):
+    """
+    Content hash (BLAKE2b) of a silver file. Hashes are remembered per
+    (path, size, mtime) so an unchanged file is not read again.
+    """
+    stat = os.stat(path)
+    memo_key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    memo_path = os.path.join(cache_dir, HASH_MEMO_FILE)
+    memo = {}
+    if os.path.exists(memo_path):
+        with open(memo_path, 'r', encoding='utf-8') as f:
+            memo = json.load(f)
+    if memo_key in memo:
+        return memo[memo_key]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    memo = {k: v for k, v in memo.items()
+            if not k.startswith(os.path.abspath(path) + '|')}
+    memo[memo_key] = digest.hexdigest()
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(memo_path, 'w', encoding='utf-8') as f:
+        json.dump(memo, f)
+    return memo[memo_key]
+
+
+def _open_entry(entry_dir):
+    """Opens a complete cache entry as {column: read-only memmap}."""
+    with open(os.path.join(entry_dir, META_FILE), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    # Touch the entry so eviction sees it as recently used
+    os.utime(os.path.join(entry_dir, META_FILE))
+    columns = {}
+    for name, dtype in meta['columns'].items():
+        if meta['rows'] == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+        else:
+            columns[name] = np.memmap(os.path.join(entry_dir, f'{name}.bin'),
+                                      dtype=dtype, mode='r', shape=(meta['rows'],))
+    return columns, meta['rows']
+
+
+def _entry_size(entry_dir):
+    return sum(os.path.getsize(os.path.join(entry_dir, f)) for f in os.listdir(entry_dir))
+
+
+def evict(cache_dir=CACHE_DIR, max_mb=CACHE_MAX_MB, keep=None):
+    """Removes least recently used entries until the cache fits in max_mb."""
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, name)
+        meta_path = os.path.join(entry_dir, META_FILE)
+        if os.path.isdir(entry_dir) and os.path.exists(meta_path):
+            entries.append((os.path.getmtime(meta_path), entry_dir, _entry_size(entry_dir)))
+    total = sum(size for _, _, size in entries)
+    for _, entry_dir, size in sorted(entries):
+        if total <= max_mb * 1024 * 1024:
+            break
+        if entry_dir == keep:
+            continue
+        print(f"  Evicting silver cache entry {os.path.basename(entry_dir)}")
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total -= size
+
+
+def _build_entry(path, entry_dir, chunksize, read_csv_kwargs):
+    """
+    Parses the CSV once, yielding its chunks while appending every numeric
+    column to a raw binary file. The entry only becomes visible (renamed into
+    place) once the whole file was read with consistent dtypes.
+    """
+    tmp_dir = entry_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    dtypes = None
+    files = {}
+    rows = 0
+    complete = False
+    try:
+        for chunk in pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs):
+            if dtypes is None:
+                dtypes = {c: chunk[c].dtype.str for c in chunk.columns
+                          if pd.api.types.is_numeric_dtype(chunk[c])
+                          and not pd.api.types.is_bool_dtype(chunk[c])}
+                files = {c: open(os.path.join(tmp_dir, f'{c}.bin'), 'wb') for c in dtypes}
+            if files is not None:
+                if all(chunk[c].dtype.str == dtype for c, dtype in dtypes.items()):
+                    for c in dtypes:
+                        chunk[c].to_numpy().tofile(files[c])
+                    rows += len(chunk)
+                else:
+                    # e.g. an int column turned float in a later chunk; give up
+                    # on caching this file but keep streaming it
+                    print(f"  Column types changed within {path}; not caching it.")
+                    for f in files.values():
+                        f.close()
+                    files = None
+            yield chunk
+        complete = files is not None
+    finally:
+        for f in (files or {}).values():
+            f.close()
+        if complete:
+            with open(os.path.join(tmp_dir, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump({'source': os.path.abspath(path), 'rows': rows,
+                           'columns': dtypes or {}}, f)
+            os.replace(tmp_dir, entry_dir)
+        else:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def read_csv_chunks(path, chunksize, use_cache=False, cache_dir=CACHE_DIR,
+                    max_mb=CACHE_MAX_MB, **read_csv_kwargs):
+    """
+    Reads a silver CSV in chunks, like pd.read_csv(path, chunksize=...).
+    With use_cache, the numeric columns are served from memory-mapped binary
+    files keyed by the file's content hash: the first run parses the CSV and
+    fills the cache, later runs slice the memmaps without parsing.
+    Cached chunks contain only the numeric columns.
+    """
+    if not use_cache:
+        yield from pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs)
+        return
+
+    os.makedirs(cache_dir, exist_ok=True)
+    key = file_hash(path, cache_dir)
+    if read_csv_kwargs:
+        # Different read options (e.g. usecols) produce different columns
+        options = repr(sorted(read_csv_kwargs.items())).encode('utf-8')
+        key += '-' + hashlib.blake2b(options, digest_size=4).hexdigest()
+    entry_dir = os.path.join(cache_dir, key)
+    if os.path.exists(os.path.join(entry_dir, META_FILE)):
+        print(f"  Using silver cache for {path}")
+        columns, rows = _open_entry(entry_dir)
+        for start in range(0, rows, chunksize):
+            yield pd.DataFrame({name: values[start:start + chunksize]
+                                for name, values in columns.items()}, copy=False)
+        return
+
+    print(f"  Caching numeric columns of {path}")
+    yield from _build_entry(path, entry_dir, chunksize, read_csv_kwargs)
+    evict(cache_dir, max_mb, keep=entry_dir)
@@ -0,0 +1,83 @@
+import glob
+import os
+
+import pandas as pd
+
+from cli_options import CODECS
+
+# --- CONFIGURATION ---
+
+# Codec for silver CSV files: 'none', 'gzip' or 'zstd' (needs the optional
+# zstandard package). Readers detect the codec from the file extension, so
+# silver layers written with different codecs load the same way.
+SILVER_CODEC = os.environ.get("SILVER_CODEC", "gzip")
+
+# The codecs (extension and pandas compression options per codec) are
+# defined in cli_options.CODECS, which the command lines offer as choices.
+
+PART_PREFIX = 'part-'
+
+
+def check_codec(codec):
+    """Raises if codec is unknown or its library is not installed."""
+    if codec not in CODECS:
+        raise ValueError(f"Unknown silver codec: {codec} (choose from {', '.join(CODECS)})")
+    if codec == 'zstd':
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise ImportError("The zstd silver codec needs the zstandard package "
+                              "(pip install zstandard)")
+
+
+def _remove_other_codecs(path, keep):
+    for extension, _ in CODECS.values():
+        if path + extension != keep and os.path.exists(path + extension):
+            os.remove(path + extension)
+
+
+def write_csv(df, path, codec=SILVER_CODEC):
+    """
+    Writes df to path plus the codec's extension (e.g. silver/stores.csv.gz)
+    and removes copies of the same file in other codecs. Returns the path.
+    """
+    extension, compression = CODECS[codec]
+    output_path = path + extension
+    _remove_other_codecs(path, output_path)
+    df.to_csv(output_path, index=False, encoding='utf-8', compression=compression)
+    return output_path
+
+
+def prepare_part_dir(part_dir):
+    """Creates a dataset directory and removes part files of earlier runs,
+    which would otherwise be read along with the new ones."""
+    os.makedirs(part_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(part_dir, PART_PREFIX + '*')):
+        os.remove(stale)
+
+
+def part_path(part_dir, index, codec=SILVER_CODEC):
+    """Path of part number index of a dataset, e.g. part-00003.csv.zst."""
+    return os.path.join(part_dir, f'{PART_PREFIX}{index:05d}{CODECS[codec][0]}')
+
+
+def dataset_files(path):
+    """
+    Files of a silver dataset in order: the part files when path is a
+    directory, otherwise the single path.csv / .csv.gz / .csv.zst file.
+    """
+    extensions = tuple(extension for extension, _ in CODECS.values())
+    if os.path.isdir(path):
+        return sorted(f for f in glob.glob(os.path.join(path, PART_PREFIX + '*'))
+                      if f.endswith(extensions))
+    for extension in extensions:
+        if os.path.exists(path + extension):
+            return [path + extension]
+    raise FileNotFoundError(f"No silver dataset at {path}")
+
+
+def read_dataset(path, **read_csv_kwargs):
+    """Reads all files of a silver dataset into one DataFrame; compressed
+    files are decompressed based on their extension."""
+    return pd.concat([pd.read_csv(f, **read_csv_kwargs) for f in dataset_files(path)],
+                     ignore_index=True)
@@ -1,40 +1,36 @@
 
+import argparse
+import io
 import os
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from datetime import date
 
-# --- 1. CONFIGURATION & DATABASE CONNECTION ---
+from db import get_engine
+import silver_cache
+import silver_io
 
-# Database connection details from environment variables or defaults
-DB_USER = os.environ.get("POSTGRES_USER", "gold_user")
-DB_PASSWORD = os.environ.get("POSTGRES_PASSWORD", "gold_password")
-DB_HOST = os.environ.get("POSTGRES_HOST", "localhost")
-DB_PORT = os.environ.get("POSTGRES_PORT", "5432")
-DB_NAME = os.environ.get("POSTGRES_DB", "gold_db")
+# --- 1. CONFIGURATION & DATABASE CONNECTION ---
 
 SILVER_PATH = 'silver'
 
 
 def get_db_engine():
-    """Creates and returns a SQLAlchemy engine."""
-    url = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    try:
-        engine = create_engine(url)
-        # Test connection
-        with engine.connect() as conn:
-            print("Database connection established successfully.")
-        return engine
-    except Exception as e:
-        print(f"Failed to connect to the database: {e}")
-        return None
+    """
+    Returns the shared engine with load session settings. No connection is
+    opened here; the pool connects on the first statement.
+    """
+    return get_engine('load')
 
 
 def clear_tables(engine):
     """Clears all gold tables in the correct order before loading."""
     table_names = [
-        "fact_sales", "fact_tourism", "fact_demographics", "fact_costofliving",
-        "dim_store", "dim_product", "dim_municipality", "dim_date"
+        "fact_sales_sample", "fact_sales", "fact_tourism", "fact_demographics",
+        "fact_population_yearly", "fact_population_monthly", "fact_costofliving",
+        "dim_store", "dim_product", "dim_municipality", "dim_date",
+        "dim_accommodation_type", "dim_origin_country", "dim_age_group", "dim_gender"
     ]
     with engine.connect() as conn:
         with conn.begin():  # Start a transaction
@@ -74,9 +70,9 @@ def populate_dim_municipality(engine):
     """
     print("Populating dimension: dim_municipality")
 
-    # 1. Read from demographics.csv
-    demo_df = pd.read_csv(os.path.join(
-        SILVER_PATH, 'demographics.csv'), encoding='utf-8')
+    # 1. Read from the demographics silver parts
+    demo_df = silver_io.read_dataset(os.path.join(
+        SILVER_PATH, 'demographics'), encoding='utf-8', dtype={'ålder': str})
     
     # Extract municipality names from column headers (e.g., "Brändö Kvinnor")
     muni_cols = [
@@ -85,15 +81,14 @@ def populate_dim_municipality(engine):
     demo_munis_df = pd.DataFrame({'name': list(muni_names)})
 
     # 2. Read from stores.csv
-    stores_df = pd.read_csv(os.path.join(
-        SILVER_PATH, 'stores.csv'), encoding='utf-8')
+    stores_df = silver_io.read_dataset(os.path.join(SILVER_PATH, 'stores'), encoding='utf-8')
 
     stores_df = stores_df[["municipality_name", "municipality_code"]].rename(
         columns={"municipality_name": "name"})
 
-    # 3. Read from tourism.csv
-    tourism_df = pd.read_csv(os.path.join(
-        SILVER_PATH, 'tourism.csv'), encoding='utf-8')
+    # 3. Read from the tourism silver parts
+    tourism_df = silver_io.read_dataset(os.path.join(
+        SILVER_PATH, 'tourism'), encoding='utf-8')
 
     tourism_df = tourism_df[["municipality_name", "municipality_code"]].rename(
         columns={"municipality_name": "name"})
@@ -121,8 +116,7 @@ def populate_dim_municipality(engine):
 def populate_dim_product(engine):
     """Populates the product dimension from products.csv."""
     print("Populating dimension: dim_product")
-    df = pd.read_csv(os.path.join(
-        SILVER_PATH, 'products.csv'), encoding='utf-8')
+    df = silver_io.read_dataset(os.path.join(SILVER_PATH, 'products'), encoding='utf-8')
 
     # Rename CSV columns to match database schema
     df = df.rename(columns={
@@ -139,7 +133,7 @@ def populate_dim_product(engine):
 def populate_dim_store(engine, municipality_map):
     """Populates the store dimension, mapping municipality names to keys."""
     print("Populating dimension: dim_store")
-    df = pd.read_csv(os.path.join(SILVER_PATH, 'stores.csv'), encoding='utf-8')
+    df = silver_io.read_dataset(os.path.join(SILVER_PATH, 'stores'), encoding='utf-8')
 
     # Rename CSV columns to match database schema
     df = df.rename(columns={
@@ -154,59 +148,268 @@ def populate_dim_store(engine, municipality_map):
     dim_df.to_sql('dim_store', engine, if_exists='append', index=False)
     print("dim_store populated.")
 
+
+def populate_dim_lookup(engine, table_name, values, sort=True):
+    """
+    Populates a small lookup dimension (one 'name' column) with the distinct
+    values so fact tables can reference them by SMALLINT key. Keys follow
+    sorted order, or first-appearance order with sort=False.
+    """
+    print(f"Populating dimension: {table_name}")
+    names = list(pd.Series(values).dropna().astype(str).unique())
+    if sort:
+        names = sorted(names)
+    pd.DataFrame({'name': names}).to_sql(
+        table_name, engine, if_exists='append', index=False)
+    print(f"{table_name} populated.")
+
+
+def populate_tourism_dimensions(engine):
+    """Populates dim_accommodation_type and dim_origin_country from tourism.csv."""
+    df = silver_io.read_dataset(os.path.join(
+        SILVER_PATH, 'tourism'), encoding='utf-8',
+        usecols=['accommodation_type', 'origin_country'])
+    populate_dim_lookup(engine, 'dim_accommodation_type', df['accommodation_type'])
+    populate_dim_lookup(engine, 'dim_origin_country', df['origin_country'])
+
+
+def populate_demographics_dimensions(engine):
+    """Populates dim_age_group and dim_gender from demographics.csv."""
+    df = silver_io.read_dataset(os.path.join(
+        SILVER_PATH, 'demographics'), encoding='utf-8', dtype={'ålder': str})
+    age_groups = df.loc[df['ålder'] != 'Totalt', 'ålder']
+    # Genders are the suffixes of the "<municipality> <gender>" columns
+    genders = [col.split(' ')[1]
+               for col in df.columns if 'Kvinnor' in col or 'Män' in col]
+    # Keep the source order (0, 1, ..., 100+) rather than sorting as text
+    populate_dim_lookup(engine, 'dim_age_group', age_groups, sort=False)
+    populate_dim_lookup(engine, 'dim_gender', genders)
+
 # --- 3. FACT TABLE POPULATION ---
 
 
-def populate_fact_sales(engine, date_map, product_map, store_map):
-    """Populates the sales fact table, processing in chunks."""
+# fact_sales holds one row per natural key; silver rows sharing a key (the
+# same product sold several times in a store on one day) are summed.
+SALES_NATURAL_KEY = ['date_key', 'store_key', 'product_key']
+
+# Replaces one year of fact_sales with the staged rows: upserts them and
+# deletes the year's rows whose key is no longer staged. Rows whose values did
+# not change are not rewritten, so a corrected reload only writes the
+# corrected rows. (xmax = 0) is true for inserted rows and false for updated ones.
+MERGE_SALES_SQL = """
+    WITH src AS (
+        SELECT date_key, store_key, product_key,
+               SUM(sales_amount) AS sales_amount, SUM(units_sold) AS units_sold
+        FROM stage_fact_sales
+        WHERE date_key BETWEEN %(first_key)s AND %(last_key)s
+        GROUP BY date_key, store_key, product_key
+    ),
+    merged AS (
+        INSERT INTO fact_sales AS fs (date_key, store_key, product_key, sales_amount, units_sold)
+        SELECT date_key, store_key, product_key, sales_amount, units_sold FROM src
+        ON CONFLICT (date_key, store_key, product_key) DO UPDATE
+        SET sales_amount = EXCLUDED.sales_amount, units_sold = EXCLUDED.units_sold
+        WHERE (fs.sales_amount, fs.units_sold)
+              IS DISTINCT FROM (EXCLUDED.sales_amount, EXCLUDED.units_sold)
+        RETURNING (xmax = 0) AS inserted
+    ),
+    deleted AS (
+        DELETE FROM fact_sales fs
+        WHERE fs.date_key BETWEEN %(first_key)s AND %(last_key)s
+          AND NOT EXISTS (
+              SELECT 1 FROM src
+              WHERE src.date_key = fs.date_key AND src.store_key = fs.store_key
+                AND src.product_key = fs.product_key)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM src),
+           COUNT(*) FILTER (WHERE inserted),
+           COUNT(*) FILTER (WHERE NOT inserted),
+           (SELECT COUNT(*) FROM deleted)
+    FROM merged
+"""
+
+
+def stage_sales_chunk(cursor, fact_df):
+    """Appends a chunk of fact rows to the stage_fact_sales temp table with COPY."""
+    buffer = io.StringIO()
+    fact_df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.copy_expert(
+        "COPY stage_fact_sales (date_key, store_key, product_key, sales_amount, units_sold) "
+        "FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def populate_fact_sales(engine, date_map, product_map, store_map, use_cache=False,
+                        years=None):
+    """
+    Loads the sales fact table by merging on its natural key: silver rows are
+    COPied into a temp table in chunks and then merged one year at a time,
+    reporting inserted/updated/unchanged/deleted rows per year. Loading into
+    a filled table replaces every loaded year, including rows whose key is
+    missing from the silver data; years limits the load to those years (a
+    requested year without silver rows is emptied). With use_cache, the
+    numeric silver columns are read from the memory-mapped silver cache.
+    Returns the totals and the merged years.
+    """
     print("Populating fact table: fact_sales")
 
     chunk_size = 100000
-    sales_file = os.path.join(SILVER_PATH, 'grocery_sales.csv')
-
-    for i, chunk in enumerate(pd.read_csv(sales_file, chunksize=chunk_size, encoding='utf-8')):
-        print(f"  Processing chunk {i+1}...")
-
-        # Map business keys to surrogate keys
-        chunk['date_key'] = pd.to_datetime(chunk['date']).dt.strftime(
-            '%Y%m%d').astype(int).map(date_map)
-        chunk['product_key'] = chunk['product_id'].map(product_map)
-        chunk['store_key'] = chunk['store_id'].map(store_map)
-
-        # Select and rename columns for the fact table
-        fact_df = chunk[['date_key', 'product_key',
-                         'store_key', 'sales_amount', 'units_sold']]
-
-        fact_df.to_sql('fact_sales', engine, if_exists='append', index=False)
-
-    print("fact_sales populated.")
+    sales_files = silver_io.dataset_files(os.path.join(SILVER_PATH, 'grocery_sales'))
 
-
-def populate_fact_tourism(engine, date_map, municipality_map):
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS stage_fact_sales")
+        cursor.execute("""
+            CREATE TEMP TABLE stage_fact_sales (
+                date_key INTEGER, store_key INTEGER, product_key INTEGER,
+                sales_amount NUMERIC(10, 2), units_sold INTEGER)
+        """)
+
+        loaded_years = set()
+        skipped = 0
+        chunks = (chunk for sales_file in sales_files
+                  for chunk in silver_cache.read_csv_chunks(
+                      sales_file, chunk_size, use_cache=use_cache, encoding='utf-8'))
+        for i, chunk in enumerate(chunks):
+            print(f"  Staging chunk {i+1}...")
+            if years:
+                chunk = chunk[chunk['year'].isin(years)]
+
+            # Map business keys to surrogate keys. The YYYYMMDD date key is built
+            # from the numeric year/month/day columns.
+            chunk['date_key'] = (chunk['year'].astype(int) * 10000
+                                 + chunk['month'].astype(int) * 100
+                                 + chunk['day'].astype(int)).map(date_map)
+            chunk['product_key'] = chunk['product_id'].map(product_map)
+            chunk['store_key'] = chunk['store_id'].map(store_map)
+
+            # Rows without a complete natural key cannot be merged
+            mapped = chunk[SALES_NATURAL_KEY].notna().all(axis=1)
+            skipped += int((~mapped).sum())
+            fact_df = chunk.loc[mapped, SALES_NATURAL_KEY + ['sales_amount', 'units_sold']]
+            fact_df = fact_df.astype({key: int for key in SALES_NATURAL_KEY})
+
+            stage_sales_chunk(cursor, fact_df)
+            loaded_years.update(int(year) for year in chunk.loc[mapped, 'year'].unique())
+
+        if skipped:
+            print(f"  Skipped {skipped} rows with unknown date, store or product.")
+        cursor.execute("CREATE INDEX ON stage_fact_sales (date_key)")
+        cursor.execute("ANALYZE stage_fact_sales")
+
+        merged_years = sorted(loaded_years | set(years or []))
+        totals = [0, 0, 0, 0]
+        for year in merged_years:
+            # Only this year's merge is at risk if the server crashes before
+            # the WAL flush; it is redone by rerunning the merge
+            cursor.execute("SET LOCAL synchronous_commit TO off")
+            cursor.execute(MERGE_SALES_SQL, {'first_key': year * 10000 + 101,
+                                             'last_key': year * 10000 + 1231})
+            rows, inserted, updated, deleted = cursor.fetchone()
+            unchanged = rows - inserted - updated
+            print(f"  {year}: {inserted} inserted, {updated} updated, {unchanged} unchanged, "
+                  f"{deleted} deleted")
+            totals = [totals[0] + inserted, totals[1] + updated, totals[2] + unchanged,
+                      totals[3] + deleted]
+            # Commit per year; the temp table lives until the session ends
+            conn.commit()
+
+        cursor.execute("DROP TABLE stage_fact_sales")
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"fact_sales populated: {totals[0]} inserted, {totals[1]} updated, "
+          f"{totals[2]} unchanged, {totals[3]} deleted.")
+    return totals, merged_years
+
+
+# Stratified sample of fact_sales for approximate analysis (analyze_data.py
+# --sample): per month and store, SAMPLE_FRACTION of the rows but at least
+# SAMPLE_MIN_ROWS, dealt round-robin into SAMPLE_REPLICATES random groups.
+SAMPLE_FRACTION = float(os.environ.get("SALES_SAMPLE_FRACTION", "0.01"))
+SAMPLE_MIN_ROWS = 10
+SAMPLE_REPLICATES = 10
+
+BUILD_SALES_SAMPLE_SQL = """
+    INSERT INTO fact_sales_sample (sales_key, date_key, store_key, product_key,
+                                   sales_amount, units_sold, weight, replicate)
+    SELECT sales_key, date_key, store_key, product_key, sales_amount, units_sold,
+           CAST(stratum_rows AS DOUBLE PRECISION) / sample_rows,
+           MOD(row_in_stratum - 1, :replicates)
+    FROM (
+        SELECT numbered.*,
+               LEAST(stratum_rows, GREATEST(:min_rows, CEIL(stratum_rows * :fraction))) AS sample_rows
+        FROM (
+            SELECT fs.*,
+                   ROW_NUMBER() OVER (stratum ORDER BY random()) AS row_in_stratum,
+                   COUNT(*) OVER stratum AS stratum_rows
+            FROM fact_sales fs
+            {date_filter}
+            WINDOW stratum AS (PARTITION BY fs.date_key / 100, fs.store_key)
+        ) numbered
+    ) strata
+    WHERE row_in_stratum <= sample_rows
+"""
+
+
+def populate_fact_sales_sample(engine, years=None):
+    """
+    Rebuilds fact_sales_sample from fact_sales (see BUILD_SALES_SAMPLE_SQL).
+    With years, only the strata of those years are deleted and resampled;
+    strata never span years, so the rest of the sample stays valid.
+    """
+    print("Populating fact table: fact_sales_sample")
+    params = {'fraction': SAMPLE_FRACTION, 'min_rows': SAMPLE_MIN_ROWS,
+              'replicates': SAMPLE_REPLICATES}
+    rows = 0
+    with engine.begin() as conn:
+        if years is None:
+            conn.execute(text("TRUNCATE TABLE fact_sales_sample"))
+            rows = conn.execute(text(BUILD_SALES_SAMPLE_SQL.format(date_filter='')),
+                                params).rowcount
+        else:
+            build_year_sql = text(BUILD_SALES_SAMPLE_SQL.format(
+                date_filter="WHERE fs.date_key BETWEEN :first_key AND :last_key"))
+            for year in years:
+                keys = {'first_key': year * 10000 + 101, 'last_key': year * 10000 + 1231}
+                conn.execute(text("DELETE FROM fact_sales_sample "
+                                  "WHERE date_key BETWEEN :first_key AND :last_key"), keys)
+                rows += conn.execute(build_year_sql, {**params, **keys}).rowcount
+    print(f"fact_sales_sample populated with {rows} rows.")
+
+
+def populate_fact_tourism(engine, date_map, municipality_map,
+                          accommodation_type_map, origin_country_map):
     """Populates the tourism fact table."""
     print("Populating fact table: fact_tourism")
-    df = pd.read_csv(os.path.join(
-        SILVER_PATH, 'tourism.csv'), encoding='utf-8')
+    df = silver_io.read_dataset(os.path.join(
+        SILVER_PATH, 'tourism'), encoding='utf-8')
 
     # Map business keys to surrogate keys
     df['date_key'] = pd.to_datetime(df['date']).dt.strftime(
         '%Y%m%d').astype(int).map(date_map)
     df['municipality_key'] = df['municipality_name'].map(municipality_map)
+    df['accommodation_type_key'] = df['accommodation_type'].map(accommodation_type_map)
+    df['origin_country_key'] = df['origin_country'].map(origin_country_map)
 
     # Select columns for the fact table
-    fact_df = df[['date_key', 'municipality_key', 'accommodation_type',
-                  'origin_country', 'visitor_count', 'revenue']]
+    fact_df = df[['date_key', 'municipality_key', 'accommodation_type_key',
+                  'origin_country_key', 'visitor_count', 'revenue']]
 
     fact_df.to_sql('fact_tourism', engine, if_exists='append', index=False)
     print("fact_tourism populated.")
 
 
-def populate_fact_demographics(engine, date_map, municipality_map):
+def populate_fact_demographics(engine, date_map, municipality_map,
+                               age_group_map, gender_map):
     """Populates the demographics fact table by unpivoting the source data."""
     print("Populating fact table: fact_demographics")
 
-    df = pd.read_csv(os.path.join(
-        SILVER_PATH, 'demographics.csv'), encoding='utf-8')
+    df = silver_io.read_dataset(os.path.join(
+        SILVER_PATH, 'demographics'), encoding='utf-8', dtype={'ålder': str})
 
     # Rename 'ålder' to 'age_group' to match schema
     df = df.rename(columns={'ålder': 'age_group'})
@@ -230,13 +433,15 @@ def populate_fact_demographics(engine, date_map, municipality_map):
     melted_df['date_key'] = pd.to_datetime(
         melted_df['år'], format='%Y').dt.strftime('%Y0101').astype(int).map(date_map)
 
-    # Map municipality name to surrogate key
+    # Map municipality, age group and gender names to surrogate keys
     melted_df['municipality_key'] = melted_df['municipality_name'].map(
         municipality_map)
+    melted_df['age_group_key'] = melted_df['age_group'].astype(str).map(age_group_map)
+    melted_df['gender_key'] = melted_df['gender'].map(gender_map)
 
     # Clean up and select final columns
     fact_df = melted_df[['date_key', 'municipality_key',
-                         'age_group', 'gender', 'population_count']].copy()
+                         'age_group_key', 'gender_key', 'population_count']].copy()
 
     # Remove rows that couldn't be mapped (e.g., the 'Åland' total row)
     fact_df.dropna(subset=['municipality_key'], inplace=True)
@@ -247,11 +452,64 @@ def populate_fact_demographics(engine, date_map, municipality_map):
     print("fact_demographics populated.")
 
 
+def populate_population_snapshots(engine):
+    """
+    Rebuilds fact_population_yearly (population per municipality and year,
+    summed over age groups and genders) and fact_population_monthly (linear
+    interpolation between the January 1 counts). The monthly series runs
+    through the last year of fact_sales, carrying the latest count forward.
+    """
+    print("Populating fact tables: fact_population_yearly, fact_population_monthly")
+    yearly = pd.read_sql("""
+        SELECT fd.municipality_key, d.year, SUM(fd.population_count) AS population
+        FROM fact_demographics fd
+        JOIN dim_date d ON fd.date_key = d.date_key
+        GROUP BY fd.municipality_key, d.year
+    """, engine)
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE TABLE fact_population_yearly, fact_population_monthly"))
+    if yearly.empty:
+        print("No demographics loaded; population snapshots left empty.")
+        return
+    yearly.to_sql('fact_population_yearly', engine, if_exists='append', index=False)
+
+    last_sales_year = pd.read_sql(
+        "SELECT MAX(date_key) / 10000 AS year FROM fact_sales", engine)['year'].iloc[0]
+    first_year = int(yearly['year'].min())
+    last_year = int(yearly['year'].max())
+    if pd.notna(last_sales_year):
+        last_year = max(last_year, int(last_sales_year))
+
+    # Population on January 1 of each year (and of the year after the last),
+    # interpolated across missing years and carried forward at the end
+    wide = (yearly.pivot(index='municipality_key', columns='year', values='population')
+            .reindex(columns=range(first_year, last_year + 2))
+            .astype(float)
+            .interpolate(axis=1, limit_area='inside')
+            .ffill(axis=1))
+    start = wide.iloc[:, :-1].to_numpy()
+    end = wide.iloc[:, 1:].to_numpy()
+    fraction = np.arange(12) / 12.0
+    monthly = start[:, :, None] + (end - start)[:, :, None] * fraction
+
+    keys, years, months = np.meshgrid(wide.index, wide.columns[:-1], np.arange(1, 13),
+                                      indexing='ij')
+    monthly_df = pd.DataFrame({
+        'municipality_key': keys.ravel(),
+        'year': years.ravel(),
+        'month_of_year': months.ravel(),
+        'population': monthly.ravel(),
+    }).dropna(subset=['population'])
+    monthly_df.to_sql('fact_population_monthly', engine, if_exists='append', index=False)
+    print(f"Population snapshots populated: {len(yearly)} yearly and "
+          f"{len(monthly_df)} monthly rows.")
+
+
 def populate_fact_costofliving(engine, date_map):
     """Populates the cost of living fact table."""
     print("Populating fact table: fact_costofliving")
-    df = pd.read_csv(os.path.join(
-        SILVER_PATH, 'costofliving.csv'), encoding='utf-8')
+    df = silver_io.read_dataset(os.path.join(
+        SILVER_PATH, 'costofliving'), encoding='utf-8')
 
     # Map dates to surrogate keys (verifying they exist in dim_date)
     df['date_key'] = pd.to_datetime(df['date']).dt.strftime(
@@ -280,11 +538,25 @@ def get_dimension_map(engine, table_name, key_col, value_col):
         return df.set_index(key_col)[value_col].to_dict()
 
 
-def main():
+def merge_sales(use_cache=False, years=None):
+    """
+    Merges the silver sales into an already loaded gold layer without
+    clearing it, e.g. after correcting one year's bronze sales file.
+    """
+    engine = get_db_engine()
+    date_map = get_dimension_map(engine, 'dim_date', 'date_key', 'date_key')
+    product_map = get_dimension_map(engine, 'dim_product', 'product_id', 'product_key')
+    store_map = get_dimension_map(engine, 'dim_store', 'store_id', 'store_key')
+    _, merged_years = populate_fact_sales(engine, date_map, product_map, store_map,
+                                          use_cache, years)
+    populate_fact_sales_sample(engine, merged_years)
+    # The monthly population series follows the sales years
+    populate_population_snapshots(engine)
+
+
+def main(use_cache=False):
     """Main ETL orchestration function."""
     engine = get_db_engine()
-    if not engine:
-        return
 
     # It's good practice to clear tables to ensure a fresh load
     clear_tables(engine)
@@ -293,6 +565,8 @@ def main():
     populate_dim_date(engine)
     populate_dim_municipality(engine)
     populate_dim_product(engine)
+    populate_tourism_dimensions(engine)
+    populate_demographics_dimensions(engine)
 
     # --- Create mapping dictionaries for FKs ---
     print("\nCreating dimension maps for fact processing...")
@@ -302,6 +576,13 @@ def main():
         engine, 'dim_date', 'date_key', 'date_key')  # Simple 1:1 map
     product_map = get_dimension_map(
         engine, 'dim_product', 'product_id', 'product_key')
+    accommodation_type_map = get_dimension_map(
+        engine, 'dim_accommodation_type', 'name', 'accommodation_type_key')
+    origin_country_map = get_dimension_map(
+        engine, 'dim_origin_country', 'name', 'origin_country_key')
+    age_group_map = get_dimension_map(
+        engine, 'dim_age_group', 'name', 'age_group_key')
+    gender_map = get_dimension_map(engine, 'dim_gender', 'name', 'gender_key')
 
     # --- Populate remaining dimensions that have dependencies ---
     populate_dim_store(engine, municipality_map)
@@ -311,13 +592,29 @@ def main():
 
     # --- Populate Fact Tables ---
     print("\nPopulating Fact Tables...")
-    populate_fact_sales(engine, date_map, product_map, store_map)
-    populate_fact_tourism(engine, date_map, municipality_map)
-    populate_fact_demographics(engine, date_map, municipality_map)
+    populate_fact_sales(engine, date_map, product_map, store_map, use_cache)
+    populate_fact_sales_sample(engine)
+    populate_fact_tourism(engine, date_map, municipality_map,
+                          accommodation_type_map, origin_country_map)
+    populate_fact_demographics(engine, date_map, municipality_map,
+                               age_group_map, gender_map)
+    populate_population_snapshots(engine)
     populate_fact_costofliving(engine, date_map)
 
     print("\nETL process completed successfully!")
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Load the silver layer into the gold star schema.")
+    parser.add_argument('--cache', action='store_true',
+                        help="Read silver sales through the memory-mapped silver cache "
+                             "(SILVER_CACHE_DIR, SILVER_CACHE_MAX_MB)")
+    parser.add_argument('--merge-sales', action='store_true',
+                        help="Only upsert fact_sales into the existing gold tables")
+    parser.add_argument('--years', type=int, nargs='+',
+                        help="With --merge-sales, only merge sales of these years")
+    args = parser.parse_args()
+    if args.merge_sales:
+        merge_sales(use_cache=args.cache, years=args.years)
+    else:
+        main(use_cache=args.cache)
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from analysis_stats import correlate, p_values, random_group_intervals
+
+
+def grouped_frame(seed=0, groups=4, rows=30):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'group': np.repeat([f'g{i}' for i in range(groups)], rows),
+        'x': rng.normal(size=groups * rows),
+    })
+    df['y'] = df['x'] * rng.uniform(-1, 1, size=groups).repeat(rows) + rng.normal(size=len(df))
+    return df
+
+
+def scipy_result(df, test):
+    result = test(df['x'], df['y'])
+    return result[0], result[1]
+
+
+@pytest.mark.parametrize('method, test', [('pearson', stats.pearsonr),
+                                          ('spearman', stats.spearmanr)])
+def test_correlate_matches_scipy_per_group(method, test):
+    df = grouped_frame()
+    result = correlate(df, ('x', 'y'), by='group', method=method).set_index('group')
+    for name, group in df.groupby('group'):
+        r, p = scipy_result(group, test)
+        assert result.loc[name, 'n'] == len(group)
+        assert result.loc[name, 'r'] == pytest.approx(r)
+        assert result.loc[name, 'p_value'] == pytest.approx(p)
+
+
+def test_spearman_with_ties_matches_scipy():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'x': rng.integers(0, 4, 40), 'y': rng.integers(0, 3, 40)})
+    result = correlate(df, ('x', 'y'), method='spearman').iloc[0]
+    r, p = stats.spearmanr(df['x'], df['y'])
+    assert result['r'] == pytest.approx(r)
+    assert result['p_value'] == pytest.approx(p)
+
+
+def test_missing_values_are_ignored():
+    df = grouped_frame(groups=1)
+    df.loc[[0, 5], 'x'] = np.nan
+    df.loc[[7], 'y'] = np.nan
+    result = correlate(df, ('x', 'y'), method='spearman').iloc[0]
+    r, p = stats.spearmanr(df.dropna()['x'], df.dropna()['y'])
+    assert result['n'] == len(df) - 3
+    assert result['r'] == pytest.approx(r)
+    assert result['p_value'] == pytest.approx(p)
+
+
+def test_two_points_fit_exactly():
+    df = pd.DataFrame({'x': [1.0, 2.0], 'y': [5.0, 3.0]})
+    result = correlate(df, ('x', 'y')).iloc[0]
+    r, p = stats.pearsonr(df['x'], df['y'])
+    assert result['n'] == 2
+    assert result['r'] == pytest.approx(r) == -1.0
+    assert result['p_value'] == p == 1.0
+
+
+@pytest.mark.parametrize('x, y', [([1.0], [2.0]),
+                                  ([np.nan, 1.0], [1.0, np.nan]),
+                                  ([1.0, 1.0, 1.0], [1.0, 2.0, 3.0])])
+def test_undefined_correlations_are_nan(x, y):
+    result = correlate(pd.DataFrame({'x': x, 'y': y}), ('x', 'y')).iloc[0]
+    assert np.isnan(result['r'])
+    assert np.isnan(result['p_value'])
+
+
+def test_several_pairs_and_group_columns():
+    df = grouped_frame()
+    df['z'] = -df['y']
+    df['half'] = np.tile([0, 1], len(df) // 2)
+    result = correlate(df, [('x', 'y'), ('x', 'z')], by=['group', 'half'])
+    assert list(result.columns) == ['group', 'half', 'x', 'y', 'n', 'r', 'p_value']
+    assert len(result) == 2 * 4 * 2
+    by_pair = result.set_index(['group', 'half', 'y'])['r'].unstack()
+    np.testing.assert_allclose(by_pair['y'], -by_pair['z'])
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        correlate(grouped_frame(), ('x', 'y'), method='kendall')
+
+
+def test_p_values_match_pearsonr():
+    rng = np.random.default_rng(2)
+    rs, ns, expected = [], [], []
+    for n in [3, 5, 10, 50]:
+        x, y = rng.normal(size=n), rng.normal(size=n)
+        r, p = stats.pearsonr(x, y)
+        rs.append(r)
+        ns.append(n)
+        expected.append(p)
+    np.testing.assert_allclose(p_values(rs, ns), expected)
+
+
+def test_p_values_edge_cases():
+    np.testing.assert_array_equal(
+        p_values([1.0, -1.0, 0.3, np.nan, 0.5], [10, 10, 2, 10, 1]),
+        [0.0, 0.0, 1.0, np.nan, np.nan])
+
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman'])
+def test_rows_with_null_group_key_are_ignored(method):
+    df = pd.DataFrame({'group': ['a', 'a', 'a', None, None, 'b', 'b', 'b'],
+                       'half': [0, 0, 0, 0, 0, 0, np.nan, 0],
+                       'x': [1.0, 2.0, 3.0, 1.0, 2.0, 1.0, 2.0, 3.0],
+                       'y': [1.0, 3.0, 2.0, 3.0, 2.0, 2.0, 1.0, 3.0]})
+    result = correlate(df, ('x', 'y'), by=['group', 'half'], method=method)
+    assert result[['group', 'half', 'n']].values.tolist() == [['a', 0, 3], ['b', 0, 2]]
+    assert result['r'].notna().all()
+
+
+def test_all_group_keys_null():
+    df = pd.DataFrame({'group': [None, None], 'x': [1.0, 2.0], 'y': [2.0, 1.0]})
+    assert correlate(df, ('x', 'y'), by='group').empty
+
+
+def interval(values, confidence=0.95):
+    values = np.asarray(values, dtype=float)
+    k = len(values)
+    return stats.t.ppf(0.5 + confidence / 2, k - 1) * values.std(ddof=1) / np.sqrt(k)
+
+
+def test_random_group_intervals_with_key_missing_from_a_replicate():
+    estimate = pd.DataFrame({'store': ['a', 'b'], 'total_sales': [30.0, 60.0],
+                             'avg_sales': [3.0, 6.0], 'population': [100.0, 200.0]})
+    replicates = [
+        pd.DataFrame({'store': ['a', 'b'], 'total_sales': [20.0, 50.0],
+                      'avg_sales': [2.0, 5.0], 'population': [100.0, 200.0]}),
+        pd.DataFrame({'store': ['b', 'a'], 'total_sales': [70.0, 40.0],
+                      'avg_sales': [7.0, 4.0], 'population': [200.0, 100.0]}),
+        # Store 'a' drew no rows in this group
+        pd.DataFrame({'store': ['b'], 'total_sales': [60.0],
+                      'avg_sales': [6.0], 'population': [200.0]}),
+    ]
+    result = random_group_intervals(estimate, replicates, sums=['total_sales'],
+                                    ratios=['avg_sales'])
+
+    assert list(result.columns) == ['store', 'total_sales', 'total_sales_ci',
+                                    'avg_sales', 'avg_sales_ci', 'population']
+    # The missing sum counts as 0; the missing average is left out
+    assert result['total_sales_ci'].tolist() == pytest.approx(
+        [interval([20, 40, 0]), interval([50, 70, 60])])
+    assert result['avg_sales_ci'].tolist() == pytest.approx(
+        [interval([2, 4]), interval([5, 7, 6])])
+
+
+def test_random_group_intervals_need_two_replicates_with_the_row():
+    estimate = pd.DataFrame({'key': [1], 'ratio': [1.0]})
+    replicates = [pd.DataFrame({'key': [1], 'ratio': [1.5]}),
+                  pd.DataFrame({'key': [2], 'ratio': [0.5]})]
+    result = random_group_intervals(estimate, replicates, sums=[], ratios=['ratio'])
+    assert np.isnan(result.loc[0, 'ratio_ci'])
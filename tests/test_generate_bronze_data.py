@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+import generate_bronze_data
+
+
+def generate(output_dir, start_year, end_year, force=False):
+    return generate_bronze_data.generate(
+        output_dir=str(output_dir), start_year=start_year, end_year=end_year,
+        n_stores=2, n_products=3, rows_per_store_day=1, max_workers=1, force=force)
+
+
+def sales_files(output_dir):
+    return sorted(name for name in os.listdir(output_dir / 'grocery')
+                  if name.startswith('grocery_sales_'))
+
+
+def test_refuses_to_overwrite_existing_bronze_data(tmp_path):
+    fetched = tmp_path / 'demographics' / 'api_data_gender.csv'
+    fetched.parent.mkdir()
+    fetched.write_text('fetched from the API', encoding='utf-8')
+
+    with pytest.raises(FileExistsError):
+        generate(tmp_path, 2021, 2021)
+    assert fetched.read_text(encoding='utf-8') == 'fetched from the API'
+    assert not (tmp_path / 'grocery').exists()
+
+
+def test_force_replaces_files_and_removes_stale_sales_years(tmp_path):
+    generate(tmp_path, 2020, 2022)
+    assert sales_files(tmp_path) == ['grocery_sales_2020.json', 'grocery_sales_2021.json',
+                                     'grocery_sales_2022.json']
+    with pytest.raises(FileExistsError):
+        generate(tmp_path, 2021, 2021)
+
+    assert generate(tmp_path, 2021, 2021, force=True) == 2 * 365
+    assert sales_files(tmp_path) == ['grocery_sales_2021.json']
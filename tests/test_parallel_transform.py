@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import parallel_transform
+import process_to_silver
+import silver_io
+from validation import QUARANTINE_DIR
+
+PART_BYTES = 700
+
+
+def write_tourism(path, rows=300):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2021-01-01', periods=rows, freq='D')
+    df = pd.DataFrame({
+        'municipality_code': 'GE',
+        'municipality_name': 'Geta',
+        'year': dates.year,
+        'month': dates.month,
+        'date': dates.strftime('%Y-%m-%d'),
+        'visitor_count': rng.integers(0, 500, rows),
+        'accommodation_type': rng.choice(['hotel', 'hostel', 'cottage'], rows),
+        'origin_country': 'Finland',
+        'revenue': rng.uniform(0, 1000, rows).round(2),
+    })
+    # A few rows for the quarantine: wrong year, bad date, missing count
+    df.loc[10, 'year'] = 1999
+    df.loc[55, 'date'] = 'not a date'
+    df['visitor_count'] = df['visitor_count'].astype(object)
+    df.loc[120, 'visitor_count'] = None
+    df.to_csv(path, index=False)
+
+
+def run(input_path, output_dir, part_mb, max_workers):
+    parts = parallel_transform.run_partitioned(
+        str(input_path), str(output_dir), 'tourism', process_to_silver.transform_tourism,
+        rules=process_to_silver.TOURISM_RULES, part_mb=part_mb, max_workers=max_workers,
+        codec='gzip', encoding='utf-8')
+    silver = silver_io.read_dataset(str(output_dir / 'tourism'), encoding='utf-8')
+    rejected = pd.read_csv(output_dir / QUARANTINE_DIR / 'tourism_rejected.csv')
+    return parts, silver, rejected
+
+
+def test_split_row_ranges_cover_whole_rows(tmp_path):
+    path = tmp_path / 'tourism_data.csv'
+    write_tourism(path)
+    data = path.read_bytes()
+    header, ranges = parallel_transform.split_row_ranges(str(path), PART_BYTES)
+
+    assert header == data[:len(header)]
+    assert ranges[0][0] == len(header) and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(data[end - 1:end] == b'\n' for _, end in ranges)
+    # The requested sizes land inside rows, which the split has to finish
+    assert any(data[start + PART_BYTES - 1:start + PART_BYTES] != b'\n'
+               for start, _ in ranges[:-1])
+
+
+def test_several_parts_equal_a_single_part(tmp_path):
+    input_path = tmp_path / 'tourism_data.csv'
+    write_tourism(input_path)
+
+    single_parts, single, single_rejected = run(
+        input_path, tmp_path / 'single', part_mb=64, max_workers=1)
+    parts, multi, multi_rejected = run(
+        input_path, tmp_path / 'multi', part_mb=PART_BYTES / 1024 / 1024, max_workers=2)
+
+    assert len(single_parts) == 1
+    assert len(parts) > 5
+    assert all(os.path.exists(p) for p in parts)
+    assert len(single) == 297
+    pd.testing.assert_frame_equal(multi, single)
+    pd.testing.assert_frame_equal(multi_rejected, single_rejected)
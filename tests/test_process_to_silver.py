@@ -0,0 +1,46 @@
+import json
+
+import pandas as pd
+
+import process_to_silver
+
+CONTEXT = {'store_ids': {1}, 'product_ids': {8}}
+
+
+def write_sales(tmp_path, units):
+    path = tmp_path / 'grocery_sales_2021.json'
+    path.write_text(json.dumps([
+        {'store_id': 'STORE_001', 'product_id': 'PROD_008', 'date': '2021-01-01',
+         'sales_amount': 10.5, 'units_sold': value} for value in units]), encoding='utf-8')
+    return str(path)
+
+
+def test_fractional_units_sold_are_quarantined(tmp_path):
+    path = write_sales(tmp_path, [3, 2.7, 4.0, None])
+    df, rejected, counts, total_rows = process_to_silver.process_single_file(path, CONTEXT)
+
+    assert total_rows == 4
+    assert df['units_sold'].tolist() == [3, 4]
+    assert rejected['rejected_by'].tolist() == [
+        'units_sold is integer', 'not_null(store_id, product_id, date, sales_amount, units_sold)']
+    assert counts['units_sold is integer'] == 1
+
+
+def test_missing_tourism_date_is_counted_once():
+    raw = pd.DataFrame({
+        'municipality_name': ['Geta', 'Geta', 'Geta', 'Geta'],
+        'year': ['2021', '2021', '2020', ''],
+        'month': ['1', '2', '1', '1'],
+        'date': ['2021-01-01', 'not a date', '2021-01-01', '2021-01-01'],
+        'visitor_count': ['3', '4', '5', '6'],
+        'accommodation_type': ['hotel'] * 4,
+    })
+    df, rejected, counts = process_to_silver.transform_tourism(raw)
+
+    assert len(df) == 1
+    assert rejected['rejected_by'].tolist() == [
+        'not_null(municipality_name, date, year, month, visitor_count)',
+        'year matches date',
+        'not_null(municipality_name, date, year, month, visitor_count)']
+    assert counts['year matches date'] == 1
+    assert counts['month matches date'] == 0
@@ -0,0 +1,92 @@
+"""
+The push-down correlations (corr() / regr_count() in PostgreSQL) must agree
+with analysis_stats.correlate. Skipped when the gold database cannot be
+reached (see db.py for the connection settings).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+import analyze_data
+from analysis_stats import correlate, p_values
+from db import get_database_url, get_engine
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Same aggregates as the analysis_queries/*_corr.sql files
+CORRELATION_SQL = """
+    SELECT grp, regr_count(y, x) AS n, corr(x, y) AS r
+    FROM unnest(CAST(:grp AS text[]), CAST(:x AS double precision[]),
+                CAST(:y AS double precision[])) AS t(grp, x, y)
+    GROUP BY grp
+"""
+
+
+@pytest.fixture(scope='module')
+def engine():
+    try:
+        probe = create_engine(get_database_url(), connect_args={'connect_timeout': 3})
+        with probe.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        probe.dispose()
+    except Exception as e:
+        pytest.skip(f"Gold database not reachable: {e}")
+    return get_engine()
+
+
+def test_sql_correlation_matches_client(engine):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=60)
+    df = pd.DataFrame({'grp': np.repeat(['a', 'b', 'c'], 20), 'x': x,
+                       'y': x * np.repeat([0.5, -2.0, 0.0], 20) + rng.normal(size=60)})
+    df.loc[[3, 25], 'x'] = np.nan
+    df.loc[[40], 'y'] = np.nan
+    edge_cases = pd.DataFrame({
+        'grp': ['two', 'two', 'one', 'constant', 'constant', 'constant'],
+        'x': [1.0, 2.0, 1.0, 4.0, 4.0, 4.0],
+        'y': [3.0, 1.0, 2.0, 1.0, 2.0, 3.0],
+    })
+    df = pd.concat([df, edge_cases], ignore_index=True)
+
+    client = correlate(df, ('x', 'y'), by='grp').set_index('grp')
+    with engine.connect() as conn:
+        server = pd.read_sql(text(CORRELATION_SQL), conn, params={
+            'grp': df['grp'].tolist(),
+            'x': [None if np.isnan(v) else v for v in df['x']],
+            'y': [None if np.isnan(v) else v for v in df['y']],
+        }).set_index('grp').loc[client.index]
+    server['r'] = pd.to_numeric(server['r'])
+
+    np.testing.assert_array_equal(server['n'], client['n'])
+    np.testing.assert_allclose(server['r'], client['r'], equal_nan=True)
+    np.testing.assert_allclose(p_values(server['r'], server['n']), client['p_value'],
+                               equal_nan=True)
+
+
+@pytest.mark.parametrize('compute, keys', [
+    (analyze_data.municipality_sales_tourism_correlation, ['x', 'y']),
+    (analyze_data.category_seasonal_tourism_correlation, ['category', 'x', 'y']),
+], ids=['Q3', 'Q10'])
+def test_gold_pushdown_matches_client(engine, compute, keys, monkeypatch):
+    with engine.connect() as conn:
+        loaded = (conn.execute(text("SELECT to_regclass('fact_sales')")).scalar()
+                  and conn.execute(text("SELECT EXISTS (SELECT 1 FROM fact_sales)")).scalar())
+    if not loaded:
+        pytest.skip("Gold layer not loaded")
+    # The analysis query paths are relative to the repository root
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(analyze_data, 'sample_method', None)
+
+    client = compute(pushdown=False)
+    server = compute(pushdown=True)
+    merged = client.merge(server, on=keys, how='outer',
+                          suffixes=('_client', '_server'), indicator=True)
+    assert len(merged) > 0
+    assert (merged['_merge'] == 'both').all()
+    np.testing.assert_array_equal(merged['n_client'], merged['n_server'])
+    np.testing.assert_allclose(merged['r_client'], merged['r_server'], equal_nan=True)
+    np.testing.assert_allclose(merged['p_value_client'], merged['p_value_server'],
+                               equal_nan=True)
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import silver_cache
+
+
+def write_sales(path, seed=0, rows=250):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'store_id': rng.integers(1, 50, rows),
+        'date': pd.date_range('2021-01-01', periods=rows).strftime('%Y-%m-%d'),
+        'sales_amount': rng.uniform(0, 500, rows).round(2),
+        'units_sold': rng.integers(0, 30, rows),
+    })
+    df.to_csv(path, index=False)
+    return df
+
+
+def read_all(path, cache_dir, chunksize=100):
+    chunks = silver_cache.read_csv_chunks(str(path), chunksize, use_cache=True,
+                                          cache_dir=str(cache_dir))
+    return pd.concat(list(chunks), ignore_index=True)
+
+
+def entries(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir)
+                  if os.path.exists(os.path.join(cache_dir, name, silver_cache.META_FILE)))
+
+
+def test_cached_read_equals_read_csv(tmp_path):
+    path = tmp_path / 'sales.csv.gz'
+    write_sales(path)
+    cache_dir = tmp_path / 'cache'
+    expected = pd.read_csv(path).select_dtypes('number')
+
+    first = read_all(path, cache_dir)
+    assert len(entries(cache_dir)) == 1
+    second = read_all(path, cache_dir)
+
+    pd.testing.assert_frame_equal(first[expected.columns], expected)
+    pd.testing.assert_frame_equal(second, expected)
+
+
+def test_modified_source_invalidates_entry(tmp_path):
+    path = tmp_path / 'sales.csv'
+    write_sales(path, seed=0)
+    cache_dir = tmp_path / 'cache'
+    read_all(path, cache_dir)
+
+    write_sales(path, seed=1)
+    # A rewrite within the same clock tick can keep size and mtime; move the
+    # mtime forward like a later edit would
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    expected = pd.read_csv(path).select_dtypes('number')
+
+    pd.testing.assert_frame_equal(read_all(path, cache_dir)[expected.columns], expected)
+    pd.testing.assert_frame_equal(read_all(path, cache_dir), expected)
+    assert len(entries(cache_dir)) == 2
+
+
+def test_evict_keeps_newest_entries(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    for seed in range(4):
+        path = tmp_path / f'sales_{seed}.csv'
+        write_sales(path, seed=seed)
+        read_all(path, cache_dir)
+    names = entries(cache_dir)
+    assert len(names) == 4
+
+    # Mark the entries as used in a known order, oldest first
+    for age, name in enumerate(names):
+        os.utime(os.path.join(cache_dir, name, silver_cache.META_FILE), (1000 + age, 1000 + age))
+    sizes = [silver_cache._entry_size(os.path.join(cache_dir, name)) for name in names]
+    newest_two_mb = (sizes[2] + sizes[3]) / 1024 / 1024
+
+    silver_cache.evict(str(cache_dir), max_mb=newest_two_mb)
+    assert entries(cache_dir) == names[2:]
+
+    # An entry passed as keep survives even when it is the oldest
+    silver_cache.evict(str(cache_dir), max_mb=0, keep=os.path.join(str(cache_dir), names[2]))
+    assert entries(cache_dir) == [names[2]]
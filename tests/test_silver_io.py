@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+import pytest
+
+import silver_io
+
+
+def sample_frame():
+    return pd.DataFrame({'store_id': [1, 2, 3], 'municipality_name': ['Geta', 'Föglö', 'Sund'],
+                         'sales_amount': [10.5, 0.0, 99.99]})
+
+
+def check_codec_available(codec):
+    try:
+        silver_io.check_codec(codec)
+    except ImportError as e:
+        pytest.skip(str(e))
+
+
+@pytest.mark.parametrize('codec', list(silver_io.CODECS))
+def test_write_csv_round_trip(tmp_path, codec):
+    check_codec_available(codec)
+    df = sample_frame()
+    path = silver_io.write_csv(df, str(tmp_path / 'stores'), codec)
+
+    assert path.endswith(silver_io.CODECS[codec][0])
+    assert silver_io.dataset_files(str(tmp_path / 'stores')) == [path]
+    pd.testing.assert_frame_equal(
+        silver_io.read_dataset(str(tmp_path / 'stores'), encoding='utf-8'), df)
+
+
+@pytest.mark.parametrize('codec', list(silver_io.CODECS))
+def test_part_files_round_trip(tmp_path, codec):
+    check_codec_available(codec)
+    df = sample_frame()
+    part_dir = str(tmp_path / 'grocery_sales')
+    silver_io.prepare_part_dir(part_dir)
+    for i, rows in enumerate([[0], [1, 2]]):
+        df.iloc[rows].to_csv(silver_io.part_path(part_dir, i, codec), index=False,
+                             encoding='utf-8', compression=silver_io.CODECS[codec][1])
+
+    pd.testing.assert_frame_equal(silver_io.read_dataset(part_dir, encoding='utf-8'), df)
+
+
+def test_write_csv_removes_other_codecs(tmp_path):
+    path = str(tmp_path / 'stores')
+    silver_io.write_csv(sample_frame(), path, 'none')
+    silver_io.write_csv(sample_frame(), path, 'gzip')
+    assert os.listdir(tmp_path) == ['stores.csv.gz']
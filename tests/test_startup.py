@@ -0,0 +1,43 @@
+"""
+pipeline.py must not import the heavy libraries for --help; each stage
+imports them only once it starts (see benchmarks/bench_startup.py for the
+import times).
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cli_options import HEAVY_MODULES
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+HELP_COMMANDS = [
+    ['--help'],
+    ['fetch', '--help'],
+    ['silver', '--help'],
+    ['gold', '--help'],
+    ['analyze', '--help'],
+]
+
+
+def imported_packages(python_args):
+    """Top-level packages imported by python -X importtime <python_args>."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + python_args,
+        cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    packages = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and 'self [us]' not in line:
+            name = line.rsplit('|', 1)[1].strip()
+            packages.add(name.split('.')[0])
+    return packages
+
+
+@pytest.mark.parametrize('command', HELP_COMMANDS, ids=' '.join)
+def test_help_imports_no_heavy_modules(command):
+    packages = imported_packages(['pipeline.py'] + command)
+    assert packages, "python -X importtime reported no imports"
+    assert not packages & HEAVY_MODULES
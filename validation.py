@@ -0,0 +1,139 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# A rule flags failing rows: check(df, context) returns a boolean mask that is
+# True where a row breaks the rule. 'reject' rules move the row to quarantine,
+# 'warn' rules only count it in the report.
+Rule = namedtuple('Rule', ['name', 'check', 'action'])
+
+QUARANTINE_DIR = 'quarantine'
+
+
+# --- 1. RULE CONSTRUCTORS ---
+
+
+def not_null(*columns, action='reject'):
+    """Rows where any of the columns is missing (or failed to parse)."""
+    def check(df, context):
+        return df[list(columns)].isna().any(axis=1).to_numpy()
+    return Rule(f"not_null({', '.join(columns)})", check, action)
+
+
+def in_range(column, min_value=None, max_value=None, action='reject'):
+    """Rows where the column is below min_value or above max_value. Missing
+    values are left to not_null."""
+    def check(df, context):
+        values = df[column]
+        failed = np.zeros(len(df), dtype=bool)
+        if min_value is not None:
+            failed |= (values < min_value).to_numpy(dtype=bool, na_value=False)
+        if max_value is not None:
+            failed |= (values > max_value).to_numpy(dtype=bool, na_value=False)
+        return failed
+    return Rule(f"in_range({column}, {min_value}, {max_value})", check, action)
+
+
+def allowed_values(column, values, action='reject'):
+    """Rows where the column holds a value outside the allowed set."""
+    values = list(values)
+
+    def check(df, context):
+        return (~df[column].isin(values) & df[column].notna()).to_numpy()
+    return Rule(f"allowed_values({column})", check, action)
+
+
+def references(column, context_key, action='reject'):
+    """Rows whose key does not exist in context[context_key], e.g. sales
+    store_ids that are missing from stores.json."""
+    def check(df, context):
+        known = np.asarray(list(context[context_key]))
+        return (~df[column].isin(known) & df[column].notna()).to_numpy()
+    return Rule(f"references({column} -> {context_key})", check, action)
+
+
+def expression(name, is_valid, action='reject'):
+    """Custom rule; is_valid(df) returns a boolean Series of passing rows."""
+    def check(df, context):
+        return ~is_valid(df).to_numpy(dtype=bool, na_value=True)
+    return Rule(name, check, action)
+
+
+# --- 2. EVALUATION ---
+
+
+def apply_rules(df, rules, context=None, raw=None):
+    """
+    Evaluates all rules on df with one vectorized mask per rule.
+    Returns (valid_df, rejected_df, counts):
+    - valid_df: rows that broke no 'reject' rule.
+    - rejected_df: the rejected rows, taken from raw (the unparsed input) if
+      given, with a 'rejected_by' column naming the broken rules.
+    - counts: {rule name: failing row count} for every rule.
+    """
+    context = context or {}
+    rejected = np.zeros(len(df), dtype=bool)
+    failures = {}
+    counts = {}
+    for rule in rules:
+        failed = rule.check(df, context)
+        counts[rule.name] = int(failed.sum())
+        if rule.action == 'reject' and counts[rule.name]:
+            rejected |= failed
+            failures[rule.name] = failed
+
+    if not rejected.any():
+        return df, df.iloc[0:0].assign(rejected_by=pd.Series(dtype=object)), counts
+
+    # Reasons are only built for the (usually few) rejected rows
+    source = df if raw is None else raw
+    quarantined = source[rejected].copy()
+    reasons = pd.Series('', index=quarantined.index, dtype=object)
+    for name, failed in failures.items():
+        reasons[failed[rejected]] += name + '; '
+    quarantined['rejected_by'] = reasons.str.rstrip('; ')
+    return df[~rejected], quarantined, counts
+
+
+def merge_counts(all_counts):
+    """Sums per-batch rule counts (e.g. returned by worker processes)."""
+    total = {}
+    for counts in all_counts:
+        for name, count in counts.items():
+            total[name] = total.get(name, 0) + count
+    return total
+
+
+# --- 3. REPORTING ---
+
+
+def write_quarantine(output_dir, dataset, rejected, counts, total_rows, rules):
+    """
+    Writes <dataset>_rejected.csv (when rows were rejected) and
+    <dataset>_report.csv to output_dir/quarantine and prints a summary.
+    """
+    quarantine_path = os.path.join(output_dir, QUARANTINE_DIR)
+    os.makedirs(quarantine_path, exist_ok=True)
+
+    rejected_path = os.path.join(quarantine_path, f'{dataset}_rejected.csv')
+    if len(rejected):
+        rejected.to_csv(rejected_path, index=False, encoding='utf-8')
+    elif os.path.exists(rejected_path):
+        os.remove(rejected_path)
+
+    actions = {rule.name: rule.action for rule in rules}
+    report = pd.DataFrame({
+        'dataset': dataset,
+        'rule': list(counts),
+        'action': [actions.get(name, 'reject') for name in counts],
+        'failed_rows': list(counts.values()),
+        'total_rows': total_rows,
+    })
+    report.to_csv(os.path.join(quarantine_path, f'{dataset}_report.csv'),
+                  index=False, encoding='utf-8')
+
+    print(f"  Validation: {len(rejected)} of {total_rows} {dataset} rows rejected")
+    for row in report[report['failed_rows'] > 0].itertuples(index=False):
+        print(f"    {row.action}: {row.rule} failed for {row.failed_rows} rows")